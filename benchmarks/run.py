@@ -0,0 +1,201 @@
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import subprocess
+
+from mongo_dynamic_fixture import N
+from mongo_dynamic_fixture import G
+from mongo_dynamic_fixture import G_many
+from mongo_dynamic_fixture import fields
+from mongo_dynamic_fixture import __version__
+from mongo_dynamic_fixture.schema import BaseSchema
+
+
+REPEAT = 3
+
+
+def make_schema(schema):
+    return type('BenchmarkSchema', (BaseSchema,), {'schema': schema})
+
+
+def measure(func, n, repeat=REPEAT):
+    best = None
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        func(n)
+        elapsed = timeit.default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def result(group, name, params, n, seconds):
+    return {
+        'group': group,
+        'name': name,
+        'params': params,
+        'n': n,
+        'seconds': seconds,
+        'docs_per_sec': n / seconds if seconds else None
+    }
+
+
+def bench_generate(group, name, params, schema, n, **kwargs):
+    schema_cls = make_schema(schema)
+
+    def run(n):
+        for _ in range(n):
+            N(schema_cls, **kwargs)
+
+    return result(group, name, params, n, measure(run, n))
+
+
+def bench_generate_batch(group, name, params, schema, n):
+    schema_cls = make_schema(schema)
+    rng = fields.numpy.random.default_rng()
+
+    def run(n):
+        schema_cls().generate_batch(n, rng)
+
+    return result(group, name, params, n, measure(run, n))
+
+
+def field_types():
+    return [
+        ('IntegerField', fields.IntegerField()),
+        ('IntegerField(choices)', fields.IntegerField(choices=range(100))),
+        ('DoubleField', fields.DoubleField()),
+        ('BooleanField', fields.BooleanField()),
+        ('StringField', fields.StringField()),
+        ('ArrayField', fields.ArrayField(fields.IntegerField())),
+        ('ObjectField', fields.ObjectField({
+            'integer': fields.IntegerField(),
+            'string': fields.StringField()
+        })),
+        ('IntegerField(null, blank)', fields.IntegerField(
+            null=True, null_prob=0.1, blank=True, blank_prob=0.1)),
+    ]
+
+
+def nested_schema(depth):
+    schema = {'integer': fields.IntegerField()}
+    for _ in range(depth):
+        schema = {'nested': schema}
+
+    return schema
+
+
+def generation_benchmarks(n):
+    for name, field in field_types():
+        yield bench_generate('field_type', name, {}, {'value': field}, n)
+
+    for depth in [1, 2, 4, 8, 16]:
+        yield bench_generate('nesting_depth', 'depth-%d' % depth,
+                             {'depth': depth}, nested_schema(depth), n)
+
+    for length in [1, 10, 100]:
+        field = fields.ArrayField(fields.IntegerField(), min_length=length,
+                                  max_length=length)
+        yield bench_generate('array_length', 'length-%d' % length,
+                             {'length': length}, {'value': field}, n)
+
+    for length in [10, 100, 1000]:
+        field = fields.StringField(min_length=length, max_length=length)
+        yield bench_generate('string_length', 'length-%d' % length,
+                             {'length': length}, {'value': field}, n)
+
+    if fields.numpy is not None:
+        for name, field in field_types():
+            yield bench_generate_batch('batch_field_type', name, {},
+                                       {'value': field}, n)
+
+    schema = dict(('key_%d' % i, {'value': fields.IntegerField()})
+                  for i in range(20))
+    for count in [0, 1, 5, 20]:
+        overrides = dict(('key_%d__value' % i, i) for i in range(count))
+        yield bench_generate('override_count', 'overrides-%d' % count,
+                             {'count': count}, schema, n, **overrides)
+
+
+def insertion_benchmarks(n, batch_size):
+    from mongo_dynamic_fixture.test import MongoTemporaryInstance
+
+    conn = MongoTemporaryInstance.get_instance().conn()
+    collection = conn['benchmarks']['insertion']
+    schema_cls = make_schema({
+        'name': fields.StringField(),
+        'aliases': fields.ArrayField(fields.StringField()),
+        'active': fields.BooleanField(),
+        'stats': {
+            'last_day_visits': fields.IntegerField(),
+            'average_daily_visits': fields.DoubleField()
+        }
+    })
+
+    def run_G(n):
+        collection.drop()
+        for _ in range(n):
+            G(collection, schema_cls)
+
+    def run_G_many(n):
+        collection.drop()
+        G_many(collection, schema_cls, count=n, batch_size=batch_size)
+
+    yield result('insertion', 'G', {}, n, measure(run_G, n))
+    yield result('insertion', 'G_many', {'batch_size': batch_size}, n,
+                 measure(run_G_many, n))
+
+    collection.drop()
+
+
+def git_revision():
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', 'HEAD'])
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode('ascii').strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks of mongo-dynamic-fixture')
+    parser.add_argument('-n', type=int, default=10000,
+                        help='number of documents of each benchmark')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='batch size of the insertion benchmarks')
+    parser.add_argument('--no-insertion', action='store_true',
+                        help='skip the benchmarks requiring mongod')
+    parser.add_argument('-o', '--output', help='path of the JSON report')
+    args = parser.parse_args(argv)
+
+    results = []
+    benchmarks = [generation_benchmarks(args.n)]
+    if not args.no_insertion:
+        benchmarks.append(insertion_benchmarks(args.n, args.batch_size))
+
+    for group in benchmarks:
+        for r in group:
+            sys.stderr.write('%-15s %-30s %12.0f docs/sec\n' % (
+                r['group'], r['name'], r['docs_per_sec']))
+            results.append(r)
+
+    report = {
+        'version': __version__,
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'timestamp': time.time(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,9 @@ __copyright__ = 'Copyright 2015 Lou Marvin Caraig'
 
 
 from mongo_dynamic_fixture.facades import N
+from mongo_dynamic_fixture.facades import N_iter
 from mongo_dynamic_fixture.facades import G
+from mongo_dynamic_fixture.facades import G_many
 
 
-__all__ = ['N', 'G']
+__all__ = ['N', 'N_iter', 'G', 'G_many']
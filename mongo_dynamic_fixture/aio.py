@@ -0,0 +1,88 @@
+import asyncio
+import functools
+
+from mongo_dynamic_fixture.facades import N
+from mongo_dynamic_fixture.facades import N_iter
+from mongo_dynamic_fixture.fixture import DEFAULT_BATCH_SIZE
+from mongo_dynamic_fixture.registry import registry
+from mongo_dynamic_fixture.utils import chunked
+
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+class AsyncFixture(object):
+
+    def __init__(self, conn, data):
+        self._conn = conn
+        self._data = data
+
+    @property
+    def conn(self):
+        return self._conn
+
+    @property
+    def data(self):
+        return self._data
+
+    async def insert(self):
+        registry.record(self.conn)
+        await self.conn.insert_one(self.data)
+
+    async def insert_many(self, batch_size=DEFAULT_BATCH_SIZE, ordered=True,
+                          max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                          executor=None):
+        registry.record(self.conn)
+        loop = asyncio.get_event_loop()
+        next_batch = functools.partial(
+            next, chunked(self.data, batch_size), None)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        tasks = []
+
+        async def insert_batch(batch):
+            try:
+                result = await self.conn.insert_many(batch, ordered=ordered)
+            finally:
+                semaphore.release()
+
+            return result.inserted_ids
+
+        try:
+            while True:
+                await semaphore.acquire()
+                batch = await loop.run_in_executor(executor, next_batch)
+                if batch is None:
+                    semaphore.release()
+                    break
+
+                tasks.append(asyncio.ensure_future(insert_batch(batch)))
+
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return [inserted_id for ids in results for inserted_id in ids]
+
+
+async def AG(conn, *args, **kwargs):
+    data = N(*args, **kwargs)
+    fixture = AsyncFixture(conn, data)
+    await fixture.insert()
+
+    return data
+
+
+async def AG_many(conn, *args, **kwargs):
+    kwargs.setdefault('count', 1)
+    batch_size = kwargs.pop('batch_size', DEFAULT_BATCH_SIZE)
+    ordered = kwargs.pop('ordered', True)
+    max_in_flight = kwargs.pop('max_in_flight', DEFAULT_MAX_IN_FLIGHT)
+    executor = kwargs.pop('executor', None)
+    data = N_iter(*args, **kwargs)
+    fixture = AsyncFixture(conn, data)
+
+    return await fixture.insert_many(
+        batch_size=batch_size, ordered=ordered, max_in_flight=max_in_flight,
+        executor=executor)
@@ -0,0 +1,252 @@
+import os
+import json
+import mmap
+import time
+import random
+import types
+import struct
+import hashlib
+import itertools
+import collections
+
+import six
+from bson import BSON
+from bson import ObjectId
+
+from mongo_dynamic_fixture import __version__
+from mongo_dynamic_fixture import fields
+from mongo_dynamic_fixture.encoding import RawBSONDocument
+from mongo_dynamic_fixture.export import DEFAULT_CHUNK_SIZE
+from mongo_dynamic_fixture.export import FileSink
+from mongo_dynamic_fixture.export import encode_bson
+from mongo_dynamic_fixture.fixture import DEFAULT_BATCH_SIZE
+from mongo_dynamic_fixture.fixture import Fixture
+from mongo_dynamic_fixture.indexes import INDEXES_AFTER
+from mongo_dynamic_fixture.indexes import INDEXES_BEFORE
+from mongo_dynamic_fixture.indexes import create_indexes
+from mongo_dynamic_fixture.parallel import generate_parallel
+
+
+EXTENSION = '.bson'
+COUNTERS_EXTENSION = '.counters'
+RUNTIME_ATTRIBUTES = frozenset(['_sampler', '_plan', '_sequence', '_table',
+                                '_lock', '_parents', '_sampled'])
+
+
+def attributes(obj):
+    names = set(getattr(obj, '__dict__', ()))
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, six.string_types):
+            slots = [slots]
+        names.update(slots)
+    names.discard('__dict__')
+    names.discard('__weakref__')
+
+    return sorted(name for name in names if hasattr(obj, name))
+
+
+def canonical(value):
+    if isinstance(value, type):
+        return ('class', value.__module__, value.__name__,
+                canonical(getattr(value, 'schema', None)),
+                canonical(getattr(value, 'indexes', None)))
+    if value is None or isinstance(value, (bool, float) + six.integer_types +
+                                   six.string_types + (bytes, ObjectId)):
+        return (type(value).__name__, repr(value))
+    if isinstance(value, collections.Mapping):
+        return ('dict', tuple(sorted((repr(k), canonical(v))
+                                     for k, v in six.iteritems(value))))
+    if isinstance(value, (list, tuple)):
+        return ('list', tuple(canonical(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted(canonical(v) for v in value)))
+    if hasattr(value, 'full_name'):
+        return ('collection', value.full_name)
+    if isinstance(value, (types.FunctionType, types.MethodType)):
+        return ('function', value.__module__,
+                getattr(value, '__qualname__', value.__name__))
+
+    names = attributes(value)
+    if not names:
+        return (type(value).__module__, type(value).__name__, repr(value))
+
+    ignored = RUNTIME_ATTRIBUTES
+    if isinstance(value, fields.ReferenceField):
+        ignored = ignored.union(['_choices'])
+
+    return (type(value).__module__, type(value).__name__,
+            tuple((name, canonical(getattr(value, name)))
+                  for name in names if name not in ignored))
+
+
+def fingerprint(schema_cls):
+    return hashlib.sha1(
+        repr(canonical(schema_cls)).encode('utf-8')).hexdigest()
+
+
+def counters_path(path):
+    return os.path.splitext(path)[0] + COUNTERS_EXTENSION
+
+
+def iter_documents(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            offset = 0
+            end = len(buf)
+            while offset < end:
+                size = struct.unpack('<i', buf[offset:offset + 4])[0]
+                data = buf[offset:offset + size]
+                if RawBSONDocument is not None:
+                    yield RawBSONDocument(data)
+                else:
+                    yield BSON(data).decode()
+                offset += size
+        finally:
+            buf.close()
+
+
+class DatasetCache(object):
+
+    def __init__(self, directory, max_size=None, max_age=None):
+        self._directory = directory
+        self._max_size = max_size
+        self._max_age = max_age
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def max_age(self):
+        return self._max_age
+
+    def key(self, schema_cls, count, seed, chunk_size=None, **kwargs):
+        extra = kwargs.pop('extra', {})
+        kwargs.update(extra)
+        counters = [sequence.counter
+                    for sequence in schema_cls().sequences()]
+        content = repr((__version__, fingerprint(schema_cls), count, seed,
+                        chunk_size, counters, canonical(kwargs)))
+
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + EXTENSION)
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(EXTENSION):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, now=None, keep=None):
+        now = time.time() if now is None else now
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for mtime, size, path in entries:
+            if path == keep:
+                continue
+            expired = self.max_age is not None and now - mtime > self.max_age
+            oversized = self.max_size is not None and total > self.max_size
+            if not expired and not oversized:
+                continue
+            os.remove(path)
+            if os.path.exists(counters_path(path)):
+                os.remove(counters_path(path))
+            total -= size
+            evicted.append(path)
+
+        return evicted
+
+    def N_iter(self, schema_cls, count, seed, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        schema = schema_cls()
+        if schema.references():
+            raise ValueError('DatasetCache cannot store %s, since the '
+                             'parents of its ReferenceFields are not stored '
+                             'with the dataset' % schema_cls.__name__)
+
+        key = self.key(schema_cls, count, seed,
+                       chunk_size=chunk_size if workers is not None else None,
+                       **dict(kwargs))
+        path = self.path(key)
+        if os.path.exists(path):
+            os.utime(path, None)
+            with open(counters_path(path)) as f:
+                counters = json.load(f)
+            for sequence, counter in zip(schema.sequences(), counters):
+                sequence.advance(counter)
+        else:
+            self._store(path, schema_cls, count, seed, workers, chunk_size,
+                        **kwargs)
+            self.evict(keep=path)
+
+        return iter_documents(path)
+
+    def G_many(self, conn, schema_cls, count, seed, **kwargs):
+        batch_size = kwargs.pop('batch_size', DEFAULT_BATCH_SIZE)
+        ordered = kwargs.pop('ordered', True)
+        retries = kwargs.pop('retries', 0)
+        write_concern = kwargs.pop('write_concern', None)
+        bypass_document_validation = kwargs.pop('bypass_document_validation',
+                                                False)
+        indexes = kwargs.pop('indexes', INDEXES_AFTER)
+        if indexes == INDEXES_BEFORE:
+            create_indexes(conn, schema_cls.indexes)
+        data = self.N_iter(schema_cls, count, seed, **kwargs)
+        fixture = Fixture(
+            conn, data, write_concern=write_concern,
+            bypass_document_validation=bypass_document_validation)
+        inserted_ids = fixture.insert_many(batch_size=batch_size,
+                                           ordered=ordered, retries=retries)
+        if indexes == INDEXES_AFTER:
+            create_indexes(conn, schema_cls.indexes)
+
+        return inserted_ids
+
+    def _store(self, path, schema_cls, count, seed, workers, chunk_size,
+               **kwargs):
+        if workers is not None:
+            data = itertools.chain.from_iterable(generate_parallel(
+                schema_cls, count, workers=workers, seed=seed,
+                chunk_size=chunk_size, **kwargs))
+        else:
+            data = schema_cls().iter_generate(
+                count, rng=random.Random(seed), **kwargs)
+
+        temporary_path = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            with FileSink(temporary_path) as sink:
+                for document in data:
+                    if '_id' not in document:
+                        document['_id'] = ObjectId()
+                    sink.write(encode_bson(document))
+            with open(counters_path(path), 'w') as f:
+                json.dump([sequence.counter
+                           for sequence in schema_cls().sequences()], f)
+            os.rename(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
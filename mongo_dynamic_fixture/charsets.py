@@ -0,0 +1,78 @@
+import random
+import binascii
+
+from six.moves import range
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def random_bytes(size, rng):
+    return binascii.unhexlify('%0*x' % (size * 2, rng.getrandbits(size * 8)))
+
+
+class CharsetSampler(object):
+
+    _samplers = {}
+
+    @classmethod
+    def for_charset(cls, charset):
+        sampler = cls._samplers.get(charset)
+        if sampler is None:
+            sampler = cls._samplers.setdefault(charset, cls(charset))
+
+        return sampler
+
+    def __init__(self, charset):
+        self._charset = charset
+        self._table, self._deleted, self._indexes_table = self._build_tables(
+            charset)
+        self._usable = 256 - len(self._deleted or b'')
+
+    @property
+    def charset(self):
+        return self._charset
+
+    def _build_tables(self, charset):
+        size = len(charset)
+        if not 0 < size <= 256 or any([ord(c) > 255 for c in charset]):
+            return None, None, None
+
+        usable = 256 - 256 % size
+        table = bytearray(ord(charset[b % size]) for b in range(256))
+        deleted = bytearray(range(usable, 256))
+        indexes_table = table[:size] + bytearray(256 - size)
+
+        return bytes(table), bytes(deleted), bytes(indexes_table)
+
+    def sample(self, length, rng=random):
+        if numpy is not None and isinstance(rng, numpy.random.Generator):
+            return self._sample_indexes(
+                rng.integers(len(self.charset), size=length, dtype='uint8'
+                             if self._indexes_table is not None else 'int64'))
+
+        if self._table is None:
+            return ''.join([rng.choice(self.charset) for _ in range(length)])
+
+        chars = b''
+        while len(chars) < length:
+            missing = length - len(chars)
+            raw = random_bytes(-(-missing * 256 // self._usable), rng)
+            chars += raw.translate(self._table, self._deleted)
+
+        return self._decode(chars[:length])
+
+    def _sample_indexes(self, indexes):
+        if self._indexes_table is None:
+            charset = self.charset
+            return ''.join([charset[i] for i in indexes.tolist()])
+
+        return self._decode(indexes.tobytes().translate(self._indexes_table))
+
+    def _decode(self, chars):
+        if isinstance(self.charset, bytes):
+            return chars
+
+        return chars.decode('latin-1')
@@ -0,0 +1,140 @@
+import math
+
+from six.moves import range
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def check_weights(weights):
+    if any([w < 0 for w in weights]):
+        raise ValueError('The weights must not be negative')
+    if not sum(weights) > 0:
+        raise ValueError('The sum of the weights must be positive')
+
+
+class AliasTable(object):
+
+    def __init__(self, weights):
+        weights = [float(w) for w in weights]
+        check_weights(weights)
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self._size = n
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] = scaled[g] + scaled[s] - 1.0
+            if scaled[g] < 1.0:
+                small.append(g)
+            else:
+                large.append(g)
+        self._arrays = None
+
+    def __len__(self):
+        return self._size
+
+    def sample(self, rng):
+        i = int(rng.random() * self._size)
+        if rng.random() < self._prob[i]:
+            return i
+
+        return self._alias[i]
+
+    def sample_batch(self, n, rng):
+        if self._arrays is None:
+            self._arrays = (numpy.array(self._prob), numpy.array(self._alias))
+        prob, alias = self._arrays
+        i = rng.integers(self._size, size=n)
+
+        return numpy.where(rng.random(n) < prob[i], i, alias[i])
+
+
+class Distribution(object):
+
+    discrete = False
+
+    def weights(self, n):
+        raise NotImplementedError
+
+    def sample(self, rng):
+        raise NotImplementedError(
+            '%s is a discrete distribution' % type(self).__name__)
+
+    def sample_batch(self, n, rng):
+        raise NotImplementedError(
+            '%s is a discrete distribution' % type(self).__name__)
+
+
+class Zipf(Distribution):
+
+    discrete = True
+
+    def __init__(self, exponent=1.0):
+        self._exponent = exponent
+
+    @property
+    def exponent(self):
+        return self._exponent
+
+    def weights(self, n):
+        return [1.0 / (k ** self.exponent) for k in range(1, n + 1)]
+
+
+class Normal(Distribution):
+
+    def __init__(self, mean=0.0, stddev=1.0):
+        self._mean = mean
+        self._stddev = stddev
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def stddev(self):
+        return self._stddev
+
+    def weights(self, n):
+        return [math.exp(-0.5 * ((i - self.mean) / float(self.stddev)) ** 2)
+                for i in range(n)]
+
+    def sample(self, rng):
+        return rng.gauss(self.mean, self.stddev)
+
+    def sample_batch(self, n, rng):
+        return rng.normal(self.mean, self.stddev, size=n)
+
+
+class Exponential(Distribution):
+
+    def __init__(self, rate=1.0, origin=0.0):
+        self._rate = rate
+        self._origin = origin
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @property
+    def origin(self):
+        return self._origin
+
+    def weights(self, n):
+        return [math.exp(-self.rate * max(i - self.origin, 0))
+                for i in range(n)]
+
+    def sample(self, rng):
+        return self.origin + rng.expovariate(self.rate)
+
+    def sample_batch(self, n, rng):
+        return self.origin + rng.exponential(1.0 / self.rate, size=n)
@@ -0,0 +1,18 @@
+from bson import BSON
+from bson import ObjectId
+
+try:
+    from bson.raw_bson import RawBSONDocument
+except ImportError:  # pragma: no cover
+    RawBSONDocument = None
+
+
+def encode_raw(document):
+    if RawBSONDocument is None:
+        raise ImportError('pymongo>=3.2 is required to generate raw BSON '
+                          'documents')
+
+    if '_id' not in document:
+        document['_id'] = ObjectId()
+
+    return RawBSONDocument(BSON.encode(document))
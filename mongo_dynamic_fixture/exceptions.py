@@ -4,3 +4,11 @@ class MongoDynamicFixtureException(Exception):
 
 class NotGeneratedException(MongoDynamicFixtureException):
     pass
+
+
+class UniqueValuesExhaustedException(MongoDynamicFixtureException):
+    pass
+
+
+class InvalidPathException(MongoDynamicFixtureException):
+    pass
@@ -0,0 +1,143 @@
+import io
+import os
+import gzip
+import json
+import threading
+
+from bson import BSON
+from bson import json_util
+from six.moves import queue
+
+from mongo_dynamic_fixture.utils import chunked
+
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+QUEUE_SIZE = 8
+
+
+class FileSink(object):
+
+    def __init__(self, path, compress=False, threaded=False,
+                 buffer_size=DEFAULT_BUFFER_SIZE):
+        self._path = path
+        self._compress = compress
+        self._threaded = threaded
+        f = io.open(path, 'wb', buffering=buffer_size)
+        self._file = gzip.GzipFile(fileobj=f, mode='wb') if compress else f
+        self._raw_file = f
+        self._queue = None
+        self._thread = None
+        self._error = None
+        if threaded:
+            self._queue = queue.Queue(QUEUE_SIZE)
+            self._thread = threading.Thread(target=self._consume)
+            self._thread.daemon = True
+            self._thread.start()
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def compress(self):
+        return self._compress
+
+    @property
+    def threaded(self):
+        return self._threaded
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+
+        if self._queue is not None:
+            self._queue.put(data)
+        else:
+            self._file.write(data)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+
+        try:
+            self._file.close()
+        finally:
+            if self._file is not self._raw_file:
+                self._raw_file.close()
+
+        if self._error is not None:
+            raise self._error
+
+    def _consume(self):
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+
+            if self._error is None:
+                try:
+                    self._file.write(data)
+                except Exception as e:
+                    self._error = e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def encode_bson(document):
+    raw = getattr(document, 'raw', None)
+
+    return raw if raw is not None else BSON.encode(document)
+
+
+def encode_json(document):
+    return (json_util.dumps(document) + '\n').encode('utf-8')
+
+
+def _export(sink, data, encode, chunk_size):
+    count = 0
+    for chunk in chunked(data, chunk_size):
+        sink.write(b''.join([encode(document) for document in chunk]))
+        count += len(chunk)
+
+    return count
+
+
+def export_jsonl(path, data, compress=False, threaded=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+    with FileSink(path, compress=compress, threaded=threaded) as sink:
+        return _export(sink, data, encode_json, chunk_size)
+
+
+def export_dump(directory, db_name, coll_name, data, compress=False,
+                threaded=False, chunk_size=DEFAULT_CHUNK_SIZE, indexes=None):
+    db_directory = os.path.join(directory, db_name)
+    if not os.path.isdir(db_directory):
+        os.makedirs(db_directory)
+
+    extension = '.gz' if compress else ''
+    ns = '%s.%s' % (db_name, coll_name)
+    metadata = {
+        'options': {},
+        'indexes': [{
+            'v': 2,
+            'key': {'_id': 1},
+            'name': '_id_',
+            'ns': ns
+        }] + [index.document(ns) for index in indexes or []],
+        'collectionName': coll_name
+    }
+    metadata_path = os.path.join(
+        db_directory, '%s.metadata.json%s' % (coll_name, extension))
+    with FileSink(metadata_path, compress=compress) as sink:
+        sink.write(json.dumps(metadata).encode('utf-8'))
+
+    bson_path = os.path.join(
+        db_directory, '%s.bson%s' % (coll_name, extension))
+    with FileSink(bson_path, compress=compress, threaded=threaded) as sink:
+        return _export(sink, data, encode_bson, chunk_size)
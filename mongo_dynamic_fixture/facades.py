@@ -1,21 +1,89 @@
+import random
+import itertools
+
 from mongo_dynamic_fixture.fixture import Fixture
+from mongo_dynamic_fixture.fixture import DEFAULT_BATCH_SIZE
+from mongo_dynamic_fixture.encoding import encode_raw
+from mongo_dynamic_fixture.indexes import INDEXES_AFTER
+from mongo_dynamic_fixture.indexes import INDEXES_BEFORE
+from mongo_dynamic_fixture.indexes import create_indexes
+from mongo_dynamic_fixture.utils import chunked
+from mongo_dynamic_fixture.utils import iter_count
+from mongo_dynamic_fixture.parallel import generate_parallel
 
 
 def N(*args, **kwargs):
     schema_cls = args[0] if args else None
+    rng = kwargs.pop('rng', None)
+    profiler = kwargs.pop('profiler', None)
     extra = kwargs.pop('extra', {})
     kwargs.update(extra)
     if schema_cls is not None:
-        data = schema_cls().generate(**kwargs)
+        data = schema_cls(profiler=profiler).generate(rng=rng, extra=kwargs)
     else:
         data = kwargs
 
     return data
 
 
+def N_iter(*args, **kwargs):
+    schema_cls = args[0] if args else None
+    count = kwargs.pop('count', None)
+    chunk_size = kwargs.pop('chunk_size', None)
+    raw = kwargs.pop('raw', False)
+    if schema_cls is not None:
+        data = schema_cls().iter_generate(count, raw=raw, **kwargs)
+    else:
+        data = (N(**dict(kwargs)) for _ in iter_count(count))
+        if raw:
+            data = (encode_raw(d) for d in data)
+
+    if chunk_size is not None:
+        data = chunked(data, chunk_size)
+
+    return data
+
+
 def G(conn, *args, **kwargs):
+    write_concern = kwargs.pop('write_concern', None)
+    bypass_document_validation = kwargs.pop('bypass_document_validation',
+                                            False)
     data = N(*args, **kwargs)
-    fixture = Fixture(conn, data)
+    fixture = Fixture(conn, data, write_concern=write_concern,
+                      bypass_document_validation=bypass_document_validation)
     fixture.insert()
 
     return data
+
+
+def G_many(conn, *args, **kwargs):
+    batch_size = kwargs.pop('batch_size', DEFAULT_BATCH_SIZE)
+    ordered = kwargs.pop('ordered', True)
+    retries = kwargs.pop('retries', 0)
+    write_concern = kwargs.pop('write_concern', None)
+    bypass_document_validation = kwargs.pop('bypass_document_validation',
+                                            False)
+    workers = kwargs.pop('workers', None)
+    seed = kwargs.pop('seed', None)
+    indexes = kwargs.pop('indexes', INDEXES_AFTER)
+    schema_indexes = getattr(args[0], 'indexes', None) if args else None
+    if indexes == INDEXES_BEFORE:
+        create_indexes(conn, schema_indexes)
+    if workers is not None:
+        count = kwargs.pop('count', 1)
+        data = itertools.chain.from_iterable(generate_parallel(
+            args[0], count, workers=workers, seed=seed,
+            chunk_size=batch_size, **kwargs))
+    else:
+        kwargs.setdefault('count', 1)
+        if seed is not None:
+            kwargs['rng'] = random.Random(seed)
+        data = N_iter(*args, **kwargs)
+    fixture = Fixture(conn, data, write_concern=write_concern,
+                      bypass_document_validation=bypass_document_validation)
+    inserted_ids = fixture.insert_many(batch_size=batch_size, ordered=ordered,
+                                       retries=retries)
+    if indexes == INDEXES_AFTER:
+        create_indexes(conn, schema_indexes)
+
+    return inserted_ids
@@ -1,14 +1,48 @@
 import string
+import struct
 import random
+import weakref
+import threading
 import collections
 
 import six
-
+from bson.objectid import ObjectId
+from six.moves import range
+from six.moves import zip
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from mongo_dynamic_fixture.charsets import CharsetSampler
+from mongo_dynamic_fixture.charsets import random_bytes
+from mongo_dynamic_fixture.distributions import AliasTable
+from mongo_dynamic_fixture.distributions import check_weights
 from mongo_dynamic_fixture.exceptions import NotGeneratedException
+from mongo_dynamic_fixture.fixture import Fixture
+from mongo_dynamic_fixture.unique import UniqueSequence
+
+
+NOT_GENERATED = object()
+DEFAULT_POOL_SIZE = 1000
+MAX_SAMPLED_VALUES = 10 ** 6
+MIN_TIMESTAMP = 1420070400
+MAX_TIMESTAMP = 2145916800
+
+_references = weakref.WeakSet()
+
+
+def reset_references():
+    for reference in list(_references):
+        reference.reset()
 
 
 class BaseField(object):
 
+    __slots__ = ('_required', '_null', '_blank', '_not_present_prob',
+                 '_null_prob', '_blank_prob')
+
     blank_value = ''
 
     def __init__(self, required=True, null=False, blank=False,
@@ -44,53 +78,223 @@ class BaseField(object):
     def blank_prob(self):
         return self._blank_prob
 
-    def generate(self):
-        r1 = random.random()
-        if not self.required and r1 < self.not_present_prob:
+    def generate(self, rng=None):
+        if rng is None:
+            rng = random
+
+        r1 = rng.random()
+        if not self._required and r1 < self._not_present_prob:
             raise NotGeneratedException
 
-        r2 = random.random()
-        if self.null and r2 < self.null_prob:
+        r2 = rng.random()
+        if self._null and r2 < self._null_prob:
             value = None
-        elif self.blank and r2 < self.null_prob + self.blank_prob:
+        elif self._blank and r2 < self._null_prob + self._blank_prob:
             value = self.blank_value
         else:
-            value = self._generate_value()
+            value = self._generate_value(rng)
 
         return value
 
-    def generate_value(self):
+    def generate_batch(self, n, rng):
+        values = self._generate_value_batch(n, rng)
+        if self._null or self._blank:
+            r2 = rng.random(n)
+            if self._blank:
+                blank_mask = r2 < self._null_prob + self._blank_prob
+                if self._null:
+                    blank_mask &= r2 >= self._null_prob
+                for i in numpy.flatnonzero(blank_mask):
+                    values[i] = self.blank_value
+            if self._null:
+                for i in numpy.flatnonzero(r2 < self._null_prob):
+                    values[i] = None
+
+        if not self._required:
+            r1 = rng.random(n)
+            for i in numpy.flatnonzero(r1 < self._not_present_prob):
+                values[i] = NOT_GENERATED
+
+        return values
+
+    def generate_value(self, rng):
         raise NotImplementedError
 
-    def _generate_value(self):
-        return self.generate_value()
+    def generate_value_batch(self, n, rng):
+        py_rng = random.Random(int(rng.integers(2 ** 63)))
+
+        return [self.generate_value(py_rng) for _ in range(n)]
+
+    def _generate_value(self, rng):
+        return self.generate_value(rng)
+
+    def _generate_value_batch(self, n, rng):
+        return self.generate_value_batch(n, rng)
+
+    def sequences(self):
+        return []
+
+    def references(self):
+        return []
+
+    def _compile(self):
+        not_present = not self._required and self._not_present_prob > 0
+        null = self._null and self._null_prob > 0
+        blank = self._blank and self._blank_prob > 0
+        if not_present or null or blank:
+            return self.generate
+
+        return self._generate_value
 
 
 class ChoosableBaseField(BaseField):
 
-    def __init__(self, choices=None, **kwargs):
+    __slots__ = ('_choices', '_unique', '_weights', '_distribution',
+                 '_sampled', '_sequence', '_table')
+
+    def __init__(self, choices=None, unique=False, weights=None,
+                 distribution=None, **kwargs):
         super(ChoosableBaseField, self).__init__(**kwargs)
         self._choices = choices
+        self._unique = unique
+        self._weights = weights
+        self._distribution = distribution
+        self._sampled = weights is not None or distribution is not None
+        self._sequence = None
+        self._table = None
 
     @property
     def choices(self):
         return self._choices
 
-    def _generate_value(self):
-        if self.choices is not None:
-            value = random.choice(self.choices)
+    @property
+    def unique(self):
+        return self._unique
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @property
+    def distribution(self):
+        return self._distribution
+
+    def values_count(self):
+        raise NotImplementedError(
+            '%s does not enumerate its values' % type(self).__name__)
+
+    def value_at(self, index):
+        raise NotImplementedError(
+            '%s does not enumerate its values' % type(self).__name__)
+
+    def sequences(self):
+        if self._unique:
+            return [self._unique_sequence()]
+
+        return []
+
+    def _values_count(self):
+        if self._choices is not None:
+            return len(self._choices)
+
+        return self.values_count()
+
+    def _continuous(self):
+        return False
+
+    def _check_values(self):
+        sampled = self._sampled and not self._continuous()
+        if not self._unique and not sampled:
+            return
+
+        name = type(self).__name__
+        if self._choices is not None:
+            count = len(self._choices)
         else:
-            value = self.generate_value()
+            try:
+                count = self.values_count()
+            except NotImplementedError:
+                raise ValueError(
+                    '%s requires choices to generate unique values or to be '
+                    'sampled with weights or with a discrete distribution'
+                    % name)
+            if sampled and count > MAX_SAMPLED_VALUES:
+                raise ValueError(
+                    '%s has %d values, sampling with weights or with a '
+                    'discrete distribution requires choices or at most %d '
+                    'values' % (name, count, MAX_SAMPLED_VALUES))
+
+        if self._weights is not None:
+            if len(self._weights) != count:
+                raise ValueError('%s has %d weights for %d values'
+                                 % (name, len(self._weights), count))
+            check_weights(self._weights)
+
+    def _value_at(self, index):
+        if self._choices is not None:
+            return self._choices[index]
+
+        return self.value_at(index)
+
+    def _unique_sequence(self):
+        if self._sequence is None:
+            self._sequence = UniqueSequence(self._values_count())
+
+        return self._sequence
+
+    def _alias_table(self):
+        if self._table is None:
+            weights = self._weights
+            if weights is None:
+                weights = self._distribution.weights(self._values_count())
+            self._table = AliasTable(weights)
+
+        return self._table
+
+    def _sample_value(self, rng):
+        return self._value_at(self._alias_table().sample(rng))
+
+    def _sample_value_batch(self, n, rng):
+        return [self._value_at(i) for i in
+                self._alias_table().sample_batch(n, rng).tolist()]
+
+    def _generate_value(self, rng):
+        if self._unique:
+            value = self._value_at(self._unique_sequence().next())
+        elif self._sampled:
+            value = self._sample_value(rng)
+        elif self._choices is not None:
+            value = rng.choice(self._choices)
+        else:
+            value = self.generate_value(rng)
 
         return value
 
+    def _generate_value_batch(self, n, rng):
+        if self._unique:
+            values = [self._value_at(i)
+                      for i in self._unique_sequence().take(n)]
+        elif self._sampled:
+            values = self._sample_value_batch(n, rng)
+        elif self._choices is not None:
+            choices = self._choices
+            values = [choices[i] for i in rng.integers(
+                len(choices), size=n).tolist()]
+        else:
+            values = self.generate_value_batch(n, rng)
+
+        return values
+
 
 class NumericalField(ChoosableBaseField):
 
+    __slots__ = ('_min_value', '_max_value')
+
     def __init__(self, min_value, max_value, **kwargs):
         super(NumericalField, self).__init__(**kwargs)
         self._min_value = min_value
         self._max_value = max_value
+        self._check_values()
 
     @property
     def min_value(self):
@@ -100,39 +304,92 @@ class NumericalField(ChoosableBaseField):
     def max_value(self):
         return self._max_value
 
+    def clip(self, value):
+        return min(max(value, self._min_value), self._max_value)
+
+    def clip_batch(self, values):
+        return numpy.clip(values, self._min_value, self._max_value).tolist()
+
+    def _continuous(self):
+        return (self._choices is None and self._weights is None and
+                not self._distribution.discrete)
+
+    def _sample_value(self, rng):
+        if self._continuous():
+            return self.clip(self._distribution.sample(rng))
+
+        return super(NumericalField, self)._sample_value(rng)
+
+    def _sample_value_batch(self, n, rng):
+        if self._continuous():
+            return self.clip_batch(self._distribution.sample_batch(n, rng))
+
+        return super(NumericalField, self)._sample_value_batch(n, rng)
+
 
 class IntegerField(NumericalField):
 
+    __slots__ = ()
+
     blank_value = 0
 
     def __init__(self, min_value=0, max_value=100, **kwargs):
         super(IntegerField, self).__init__(min_value, max_value, **kwargs)
 
-    def generate_value(self):
-        return random.randint(self.min_value, self.max_value)
+    def values_count(self):
+        return self._max_value - self._min_value + 1
+
+    def value_at(self, index):
+        return self._min_value + index
+
+    def clip(self, value):
+        return int(round(super(IntegerField, self).clip(value)))
+
+    def clip_batch(self, values):
+        return numpy.rint(numpy.clip(values, self._min_value, self._max_value)
+                          ).astype(numpy.int64).tolist()
+
+    def generate_value(self, rng):
+        return rng.randint(self._min_value, self._max_value)
+
+    def generate_value_batch(self, n, rng):
+        return rng.integers(self._min_value, self._max_value, size=n,
+                            endpoint=True).tolist()
 
 
 class DoubleField(NumericalField):
 
+    __slots__ = ()
+
     blank_value = 0.0
 
     def __init__(self, min_value=0.0, max_value=1.0, **kwargs):
         super(DoubleField, self).__init__(min_value, max_value, **kwargs)
 
-    def generate_value(self):
-        return random.uniform(self.min_value, self.max_value)
+    def generate_value(self, rng):
+        return rng.uniform(self._min_value, self._max_value)
+
+    def generate_value_batch(self, n, rng):
+        return rng.uniform(self._min_value, self._max_value, size=n).tolist()
 
 
 class BooleanField(BaseField):
 
+    __slots__ = ()
+
     blank_value = False
 
-    def generate_value(self):
-        return random.choice([True, False])
+    def generate_value(self, rng):
+        return rng.choice([True, False])
+
+    def generate_value_batch(self, n, rng):
+        return (rng.random(n) < 0.5).tolist()
 
 
 class StringField(ChoosableBaseField):
 
+    __slots__ = ('_min_length', '_max_length', '_charset', '_sampler')
+
     blank_value = ''
 
     def __init__(self, min_length=1, max_length=10, charset=None, **kwargs):
@@ -140,6 +397,8 @@ class StringField(ChoosableBaseField):
         self._min_length = min_length
         self._max_length = max_length
         self._charset = charset or (string.ascii_letters + string.digits)
+        self._sampler = CharsetSampler.for_charset(self._charset)
+        self._check_values()
 
     @property
     def min_length(self):
@@ -153,14 +412,192 @@ class StringField(ChoosableBaseField):
     def charset(self):
         return self._charset
 
-    def generate_value(self):
-        return ''.join([
-            random.choice(self.charset) for _ in range(random.randint(
-                self.min_length, self.max_length))])
+    def values_count(self):
+        return sum(len(self._charset) ** length for length in
+                   range(self._min_length, self._max_length + 1))
+
+    def value_at(self, index):
+        charset = self._charset
+        base = len(charset)
+        for length in range(self._min_length, self._max_length + 1):
+            count = base ** length
+            if index < count:
+                break
+            index -= count
+
+        chars = []
+        for _ in range(length):
+            index, digit = divmod(index, base)
+            chars.append(charset[digit])
+
+        return ''.join(reversed(chars))
+
+    def generate_value(self, rng):
+        return self._sampler.sample(
+            rng.randint(self._min_length, self._max_length), rng)
+
+    def generate_value_batch(self, n, rng):
+        lengths = rng.integers(self._min_length, self._max_length, size=n,
+                               endpoint=True).tolist()
+        chars = self._sampler.sample(sum(lengths), rng)
+        generated = []
+        start = 0
+        for length in lengths:
+            generated.append(chars[start:start + length])
+            start += length
+
+        return generated
+
+
+class ObjectIdField(BaseField):
+
+    __slots__ = ('_min_timestamp', '_max_timestamp')
+
+    blank_value = None
+
+    def __init__(self, min_timestamp=MIN_TIMESTAMP,
+                 max_timestamp=MAX_TIMESTAMP, **kwargs):
+        super(ObjectIdField, self).__init__(**kwargs)
+        self._min_timestamp = min_timestamp
+        self._max_timestamp = max_timestamp
+
+    @property
+    def min_timestamp(self):
+        return self._min_timestamp
+
+    @property
+    def max_timestamp(self):
+        return self._max_timestamp
+
+    def generate_value(self, rng):
+        timestamp = rng.randint(self._min_timestamp, self._max_timestamp)
+
+        return ObjectId(struct.pack('>I', timestamp) + random_bytes(8, rng))
+
+    def generate_value_batch(self, n, rng):
+        timestamps = rng.integers(self._min_timestamp, self._max_timestamp,
+                                  size=n, endpoint=True).tolist()
+        data = rng.bytes(8 * n)
+
+        return [ObjectId(struct.pack('>I', timestamp) + data[8 * i:8 * i + 8])
+                for i, timestamp in enumerate(timestamps)]
+
+
+class ReferenceField(ChoosableBaseField):
+
+    __slots__ = ('_schema_cls', '_collection', '_pool_size', '_create',
+                 '_parents', '_lock', '__weakref__')
+
+    blank_value = None
+
+    def __init__(self, schema_cls, collection=None,
+                 pool_size=DEFAULT_POOL_SIZE, create=False, **kwargs):
+        super(ReferenceField, self).__init__(**kwargs)
+        self._schema_cls = schema_cls
+        self._collection = collection
+        self._pool_size = pool_size
+        self._create = create
+        self._parents = None
+        self._lock = threading.Lock()
+        self._check_values()
+        _references.add(self)
+
+    @property
+    def schema_cls(self):
+        return self._schema_cls
+
+    @property
+    def collection(self):
+        collection = self._collection
+        if collection is not None and not hasattr(collection, 'find'):
+            collection = collection()
+
+        return collection
+
+    @property
+    def pool_size(self):
+        return self._pool_size
+
+    @property
+    def parents(self):
+        self.resolve()
+        return self._parents
+
+    @property
+    def choices(self):
+        if self._choices is None:
+            self.resolve()
+
+        return self._choices
+
+    def _check_values(self):
+        if self._weights is not None:
+            raise ValueError('ReferenceField takes a distribution instead of '
+                             'weights, since its pool is loaded lazily')
+
+    def references(self):
+        return [self]
+
+    def resolve(self):
+        with self._lock:
+            if self._choices is None:
+                self._choices = self._resolve()
+
+        return self._choices
+
+    def load(self, choices):
+        with self._lock:
+            self._choices = list(choices)
+            self._parents = None
+            self._table = None
+
+    def reset(self):
+        with self._lock:
+            self._choices = None
+            self._parents = None
+            self._table = None
+
+    def bind(self, collection):
+        self._collection = collection
+        self.reset()
+
+    def _generate_value(self, rng):
+        if self._choices is None:
+            self.resolve()
+
+        return super(ReferenceField, self)._generate_value(rng)
+
+    def _generate_value_batch(self, n, rng):
+        if self._choices is None:
+            self.resolve()
+
+        return super(ReferenceField, self)._generate_value_batch(n, rng)
+
+    def _resolve(self):
+        collection = self.collection
+        if collection is not None and not self._create:
+            cursor = collection.find({}, {'_id': 1})
+            ids = [document['_id'] for document in
+                   cursor.limit(self.pool_size)]
+            if ids:
+                return ids
+
+        schema = self.schema_cls()
+        parents = [schema.generate() for _ in range(self.pool_size)]
+        if collection is not None:
+            return Fixture(collection, parents).insert_many()
+
+        for parent in parents:
+            parent.setdefault('_id', ObjectId())
+        self._parents = parents
+
+        return [parent['_id'] for parent in parents]
 
 
 class ArrayField(BaseField):
 
+    __slots__ = ('_min_length', '_max_length', '_content_fields')
+
     blank_value = []
 
     def __init__(self, content_fields, min_length=1, max_length=10, **kwargs):
@@ -183,38 +620,153 @@ class ArrayField(BaseField):
     def content_fields(self):
         return self._content_fields
 
-    def generate_value(self):
-        return [random.choice(self.content_fields).generate() for _ in range(
-            random.randint(self.min_length, self.max_length))]
+    def sequences(self):
+        return [sequence for content_field in self._content_fields
+                for sequence in content_field.sequences()]
+
+    def references(self):
+        return [reference for content_field in self._content_fields
+                for reference in content_field.references()]
+
+    def generate_value(self, rng):
+        content_fields = self._content_fields
+        generated = []
+        for _ in range(rng.randint(self._min_length, self._max_length)):
+            try:
+                generated.append(rng.choice(content_fields).generate(rng))
+            except NotGeneratedException:
+                pass
+
+        return generated
+
+    def generate_value_batch(self, n, rng):
+        content_fields = self._content_fields
+        lengths = rng.integers(self._min_length, self._max_length, size=n,
+                               endpoint=True)
+        chosen = rng.integers(len(content_fields), size=int(lengths.sum()))
+        contents = [None] * len(chosen)
+        for i, content_field in enumerate(content_fields):
+            positions = numpy.flatnonzero(chosen == i)
+            values = content_field.generate_batch(len(positions), rng)
+            for position, value in zip(positions.tolist(), values):
+                contents[position] = value
+
+        generated = []
+        start = 0
+        for length in lengths.tolist():
+            generated.append([value for value in contents[start:start + length]
+                              if value is not NOT_GENERATED])
+            start += length
+
+        return generated
 
 
 class ObjectField(BaseField):
 
+    __slots__ = ('_schema', '_plan')
+
     blank_value = {}
 
     def __init__(self, schema, **kwargs):
         super(ObjectField, self).__init__(**kwargs)
         self._schema = schema
+        self._plan = None
 
     @property
     def schema(self):
         return self._schema
 
-    def generate_value(self):
+    def sequences(self):
+        sequences = []
+        schemas = [self._schema]
+        while schemas:
+            for v in six.itervalues(schemas.pop()):
+                if isinstance(v, BaseField):
+                    sequences.extend(v.sequences())
+                else:
+                    schemas.append(v)
 
-        def _generate_value(schema):
-            generated = {}
-            for k, v in six.iteritems(schema):
+        return sequences
+
+    def references(self):
+        references = []
+        schemas = [self._schema]
+        while schemas:
+            for v in six.itervalues(schemas.pop()):
                 if isinstance(v, BaseField):
-                    generated[k] = v.generate()
+                    references.extend(v.references())
                 else:
-                    sub_generated = {}
-                    for sub_k, sub_v in six.iteritems(v):
-                        sub_generated[sub_k] = _generate_value({
-                            sub_k: sub_v})[sub_k]
+                    schemas.append(v)
+
+        return references
 
-                    generated[k] = sub_generated
+    def generate_value(self, rng):
+        if self._plan is None:
+            self._plan = GenerationPlan(self._schema)
 
-            return generated
+        return self._plan.run(rng)
 
-        return _generate_value(self.schema)
+    def generate_value_batch(self, n, rng):
+        if self._plan is None:
+            self._plan = GenerationPlan(self._schema)
+
+        return self._plan.run_batch(n, rng)
+
+
+class GenerationPlan(object):
+
+    __slots__ = ('_steps', '_containers_count', '_profiler')
+
+    def __init__(self, schema, profiler=None, path=None):
+        self._steps = []
+        self._containers_count = 0
+        self._profiler = profiler
+        self._compile(schema, 0, path)
+
+    def _compile(self, schema, parent, path):
+        for k, v in six.iteritems(schema):
+            key_path = k if path is None else '%s.%s' % (path, k)
+            if isinstance(v, BaseField):
+                if self._profiler is None:
+                    generate = v._compile()
+                else:
+                    generate = self._profiler.instrument(v, key_path)
+                self._steps.append((parent, k, v, generate))
+            else:
+                self._containers_count += 1
+                self._steps.append((parent, k, None, None))
+                self._compile(v, self._containers_count, key_path)
+
+    def run(self, rng=None):
+        if rng is None:
+            rng = random
+
+        containers = [{}]
+        for parent, key, _, generate in self._steps:
+            if generate is None:
+                value = {}
+                containers.append(value)
+            else:
+                try:
+                    value = generate(rng)
+                except NotGeneratedException:
+                    continue
+
+            containers[parent][key] = value
+
+        return containers[0]
+
+    def run_batch(self, n, rng):
+        containers = [[{} for _ in range(n)]]
+        for parent, key, field, _ in self._steps:
+            if field is None:
+                values = [{} for _ in range(n)]
+                containers.append(values)
+            else:
+                values = field.generate_batch(n, rng)
+
+            for document, value in zip(containers[parent], values):
+                if value is not NOT_GENERATED:
+                    document[key] = value
+
+        return containers[0]
@@ -1,8 +1,29 @@
+try:
+    from pymongo.errors import BulkWriteError
+except ImportError:  # pragma: no cover
+    BulkWriteError = None
+
+try:
+    from pymongo.write_concern import WriteConcern
+except ImportError:  # pragma: no cover
+    WriteConcern = None
+
+from mongo_dynamic_fixture.registry import registry
+from mongo_dynamic_fixture.utils import chunked
+
+
+DEFAULT_BATCH_SIZE = 1000
+DUPLICATE_KEY_CODES = (11000, 11001)
+
+
 class Fixture(object):
 
-    def __init__(self, conn, data):
+    def __init__(self, conn, data, write_concern=None,
+                 bypass_document_validation=False):
         self._conn = conn
         self._data = data
+        self._write_concern = write_concern
+        self._bypass_document_validation = bypass_document_validation
 
     @property
     def conn(self):
@@ -12,5 +33,86 @@ class Fixture(object):
     def data(self):
         return self._data
 
+    @property
+    def write_concern(self):
+        return self._write_concern
+
+    @property
+    def bypass_document_validation(self):
+        return self._bypass_document_validation
+
     def insert(self):
-        self.conn.insert(self.data)
+        registry.record(self.conn)
+        conn = self._collection()
+        if hasattr(conn, 'insert_one'):
+            conn.insert_one(self.data, **self._write_options())
+        else:
+            conn.insert(self.data, **self._legacy_write_options())
+
+    def insert_many(self, batch_size=DEFAULT_BATCH_SIZE, ordered=True,
+                    retries=0):
+        registry.record(self.conn)
+        conn = self._collection()
+        inserted_ids = []
+        for batch in chunked(self.data, batch_size):
+            inserted_ids.extend(self._insert_batch(conn, batch, ordered,
+                                                   retries))
+
+        return inserted_ids
+
+    def _collection(self):
+        if self.write_concern is None or WriteConcern is None or \
+                not hasattr(self.conn, 'with_options'):
+            return self.conn
+
+        return self.conn.with_options(
+            write_concern=WriteConcern(**self.write_concern))
+
+    def _write_options(self):
+        if self.bypass_document_validation:
+            return {'bypass_document_validation': True}
+
+        return {}
+
+    def _legacy_write_options(self):
+        return dict(self.write_concern or {})
+
+    def _insert_batch(self, conn, batch, ordered, retries):
+        if not hasattr(conn, 'insert_many'):
+            return conn.insert(batch, continue_on_error=not ordered,
+                               **self._legacy_write_options())
+
+        if not retries:
+            return conn.insert_many(batch, ordered=ordered,
+                                    **self._write_options()).inserted_ids
+
+        pending = list(range(len(batch)))
+        inserted = []
+        for attempt in range(retries + 1):
+            try:
+                conn.insert_many([batch[i] for i in pending], ordered=ordered,
+                                 **self._write_options())
+            except BulkWriteError as e:
+                errors = e.details.get('writeErrors')
+                if attempt == retries or not errors or \
+                        e.details.get('writeConcernErrors'):
+                    raise
+                failed = set(error['index'] for error in errors)
+                duplicates = set(error['index'] for error in errors
+                                 if error['code'] in DUPLICATE_KEY_CODES)
+                if ordered:
+                    first = min(failed)
+                    inserted.extend(pending[:first])
+                    pending = [i for n, i in enumerate(pending)
+                               if n >= first and n not in duplicates]
+                else:
+                    inserted.extend(i for n, i in enumerate(pending)
+                                    if n not in failed)
+                    pending = [pending[n] for n in sorted(failed - duplicates)]
+                if not pending:
+                    break
+            else:
+                inserted.extend(pending)
+                break
+
+        return [batch[i]['_id'] for i in sorted(inserted)]
@@ -0,0 +1,79 @@
+import collections
+
+import six
+
+try:
+    from pymongo import IndexModel
+except ImportError:  # pragma: no cover
+    IndexModel = None
+
+
+ASCENDING = 1
+DESCENDING = -1
+
+INDEXES_BEFORE = 'before'
+INDEXES_AFTER = 'after'
+
+
+class Index(object):
+
+    def __init__(self, keys, unique=False, expire_after_seconds=None,
+                 name=None, **options):
+        if isinstance(keys, six.string_types):
+            keys = [keys]
+        self._keys = [(k, ASCENDING) if isinstance(k, six.string_types)
+                      else tuple(k) for k in keys]
+        self._unique = unique
+        self._expire_after_seconds = expire_after_seconds
+        self._name = name or '_'.join('%s_%s' % k for k in self._keys)
+        self._options = options
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def unique(self):
+        return self._unique
+
+    @property
+    def expire_after_seconds(self):
+        return self._expire_after_seconds
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def options(self):
+        options = dict(self._options)
+        options['name'] = self.name
+        if self.unique:
+            options['unique'] = True
+        if self.expire_after_seconds is not None:
+            options['expireAfterSeconds'] = self.expire_after_seconds
+
+        return options
+
+    def document(self, ns=None):
+        document = collections.OrderedDict([
+            ('v', 2),
+            ('key', collections.OrderedDict(self.keys)),
+        ])
+        document.update(sorted(six.iteritems(self.options)))
+        if ns is not None:
+            document['ns'] = ns
+
+        return document
+
+
+def create_indexes(conn, indexes):
+    if not indexes:
+        return []
+
+    if IndexModel is not None and hasattr(conn, 'create_indexes'):
+        return conn.create_indexes([IndexModel(index.keys, **index.options)
+                                    for index in indexes])
+
+    return [conn.create_index(index.keys, **index.options)
+            for index in indexes]
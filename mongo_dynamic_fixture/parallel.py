@@ -0,0 +1,94 @@
+import random
+import collections
+import multiprocessing
+
+from six.moves import zip
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # pragma: no cover
+    ProcessPoolExecutor = None
+
+from mongo_dynamic_fixture import fields
+from mongo_dynamic_fixture.encoding import encode_raw
+from mongo_dynamic_fixture.utils import split_count
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def derive_seeds(seed):
+    seeder = random.Random(seed)
+    while True:
+        yield seeder.getrandbits(64)
+
+
+def generate_chunk(schema_cls, n, seed, batch=False, raw=False, offset=0,
+                   stride=1, bases=None, pools=None, **kwargs):
+    return _generate_chunk(schema_cls, n, seed, batch, raw, offset, stride,
+                           bases, pools, **kwargs)[0]
+
+
+def _generate_chunk(schema_cls, n, seed, batch, raw, offset, stride, bases,
+                    pools, **kwargs):
+    schema = schema_cls()
+    sequences = schema.sequences()
+    for sequence, base in zip(sequences, bases or [0] * len(sequences)):
+        sequence.seek(base + offset, stride)
+    for reference, pool in zip(schema.references(), pools or []):
+        reference.load(pool)
+    if batch:
+        rng = fields.numpy.random.default_rng(seed)
+        generated = schema.generate_batch(n, rng, **kwargs)
+        if raw:
+            generated = [encode_raw(g) for g in generated]
+    else:
+        rng = random.Random(seed)
+        generated = list(schema.iter_generate(n, rng=rng, raw=raw, **kwargs))
+
+    return generated, [sequence.counter for sequence in sequences]
+
+
+def generate_parallel(schema_cls, n, workers=None, seed=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE, batch=False, raw=False,
+                      **kwargs):
+    if ProcessPoolExecutor is None:
+        raise ImportError('concurrent.futures is required to generate in '
+                          'parallel')
+    if batch and fields.numpy is None:
+        raise ImportError('numpy is required to generate batches')
+
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    workers = workers or multiprocessing.cpu_count()
+    stride = (n + chunk_size - 1) // chunk_size
+    chunks = zip(split_count(n, chunk_size), derive_seeds(seed))
+    schema = schema_cls()
+    sequences = schema.sequences()
+    bases = [sequence.counter for sequence in sequences]
+    pools = [reference.resolve() for reference in schema.references()]
+    ends = list(bases)
+
+    def result(future):
+        generated, counters = future.result()
+        for i, counter in enumerate(counters):
+            ends[i] = max(ends[i], counter - stride + 1)
+
+        return generated
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = collections.deque()
+            for offset, (size, chunk_seed) in enumerate(chunks):
+                pending.append(executor.submit(
+                    _generate_chunk, schema_cls, size, chunk_seed, batch, raw,
+                    offset, stride, bases, pools, **kwargs))
+                if len(pending) >= 2 * workers:
+                    yield result(pending.popleft())
+
+            while pending:
+                yield result(pending.popleft())
+    finally:
+        for sequence, end in zip(sequences, ends):
+            sequence.advance(end)
@@ -0,0 +1,86 @@
+import threading
+
+from six.moves import queue
+from six.moves import range
+
+from mongo_dynamic_fixture.fixture import Fixture
+
+
+DEFAULT_SIZE = 1000
+PUT_TIMEOUT = 0.1
+
+
+class FixturePool(object):
+
+    def __init__(self, schema_cls, size=DEFAULT_SIZE, rng=None, prefill=False,
+                 start=True):
+        if size < 1:
+            raise ValueError('The size of the pool must be at least 1')
+        self._schema_cls = schema_cls
+        self._schema = schema_cls()
+        self._size = size
+        self._rng = rng
+        self._queue = queue.Queue(size)
+        self._stopped = threading.Event()
+        self._thread = None
+        if prefill:
+            for _ in range(size):
+                self._queue.put_nowait(self._schema.generate(rng=rng))
+        if start:
+            self.start()
+
+    @property
+    def schema_cls(self):
+        return self._schema_cls
+
+    @property
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._refill)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def close(self):
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def _refill(self):
+        for generated in self._schema.iter_generate(rng=self._rng):
+            while not self._stopped.is_set():
+                try:
+                    self._queue.put(generated, timeout=PUT_TIMEOUT)
+                    break
+                except queue.Full:
+                    pass
+            else:
+                return
+
+    def N(self, **kwargs):
+        try:
+            generated = self._queue.get_nowait()
+        except queue.Empty:
+            generated = self._schema.generate(rng=self._rng)
+
+        return self._schema.override(generated, **kwargs)
+
+    def G(self, conn, **kwargs):
+        data = self.N(**kwargs)
+        fixture = Fixture(conn, data)
+        fixture.insert()
+
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
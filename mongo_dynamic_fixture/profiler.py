@@ -0,0 +1,80 @@
+import copy
+import timeit
+
+import six
+
+from mongo_dynamic_fixture.fields import ArrayField
+from mongo_dynamic_fixture.fields import GenerationPlan
+from mongo_dynamic_fixture.fields import ObjectField
+
+
+class InstrumentedField(object):
+
+    def __init__(self, generate):
+        self.generate = generate
+
+
+class Profiler(object):
+
+    def __init__(self):
+        self._stats = {}
+
+    def __len__(self):
+        return len(self._stats)
+
+    def reset(self):
+        for stats in six.itervalues(self._stats):
+            stats[0] = 0
+            stats[1] = 0.0
+
+    def instrument(self, field, path):
+        if isinstance(field, ArrayField):
+            field = copy.copy(field)
+            field._content_fields = [
+                InstrumentedField(self.instrument(f, path + '[]'))
+                for f in field.content_fields]
+        elif isinstance(field, ObjectField):
+            field = copy.copy(field)
+            field._plan = GenerationPlan(field.schema, profiler=self,
+                                         path=path)
+
+        return self.wrap(path, field._compile())
+
+    def wrap(self, path, generate):
+        stats = self._stats.setdefault(path, [0, 0.0])
+        timer = timeit.default_timer
+
+        def instrumented(rng=None):
+            start = timer()
+            try:
+                return generate(rng)
+            finally:
+                stats[0] += 1
+                stats[1] += timer() - start
+
+        return instrumented
+
+    def report(self):
+        return dict(
+            (path, {'calls': calls,
+                    'seconds': seconds,
+                    'per_call': seconds / calls if calls else 0.0})
+            for path, (calls, seconds) in six.iteritems(self._stats))
+
+    def table(self, sort_by='seconds', limit=None):
+        rows = sorted(six.iteritems(self.report()),
+                      key=lambda item: (-item[1][sort_by], item[0]))
+        if limit is not None:
+            rows = rows[:limit]
+
+        lines = [(path, '%d' % stats['calls'], '%.6f' % stats['seconds'],
+                  '%.3f' % (stats['per_call'] * 1e6))
+                 for path, stats in rows]
+        header = ('path', 'calls', 'seconds', 'per call (us)')
+        widths = [max(len(line[i]) for line in [header] + lines)
+                  for i in range(len(header))]
+
+        return '\n'.join(
+            '  '.join([line[0].ljust(widths[0])] +
+                      [v.rjust(w) for v, w in zip(line[1:], widths[1:])])
+            for line in [header] + lines)
@@ -0,0 +1,67 @@
+import threading
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # pragma: no cover
+    ThreadPoolExecutor = None
+
+
+class WriteRegistry(object):
+
+    def __init__(self):
+        self._collections = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._collections)
+
+    def __contains__(self, key):
+        return key in self._collections
+
+    @property
+    def collections(self):
+        with self._lock:
+            return set(self._collections)
+
+    def record(self, conn):
+        key = (conn.database.name, conn.name)
+        if key not in self._collections:
+            with self._lock:
+                self._collections.add(key)
+
+    def pop(self):
+        with self._lock:
+            collections = self._collections
+            self._collections = set()
+
+        return collections
+
+    def clear(self):
+        self.pop()
+
+
+registry = WriteRegistry()
+
+
+def purge_collections(client, collections, drop=True, workers=None):
+    def purge_collection(key):
+        db_name, coll_name = key
+        if drop:
+            client[db_name].drop_collection(coll_name)
+        elif hasattr(client[db_name][coll_name], 'delete_many'):
+            client[db_name][coll_name].delete_many({})
+        else:
+            client[db_name][coll_name].remove({})
+
+    keys = sorted(collections)
+    if workers is None or workers < 2 or len(keys) < 2:
+        for key in keys:
+            purge_collection(key)
+    else:
+        if ThreadPoolExecutor is None:  # pragma: no cover
+            raise ImportError(
+                'Parallel purge requires concurrent.futures (futures)')
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(purge_collection, keys))
+
+    return set(keys)
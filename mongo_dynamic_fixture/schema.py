@@ -1,47 +1,151 @@
 import collections
-from collections import defaultdict
 
 import six
 
 from mongo_dynamic_fixture import fields
+from mongo_dynamic_fixture.encoding import encode_raw
+from mongo_dynamic_fixture.template import Template
+from mongo_dynamic_fixture.utils import LRUCache
+from mongo_dynamic_fixture.utils import chunked
+from mongo_dynamic_fixture.utils import iter_count
+
+
+OVERRIDERS_CACHE_SIZE = 128
 
 
 class BaseSchema(fields.ObjectField):
 
+    __slots__ = ()
+
     schema = {}
+    indexes = []
+
+    _overriders_cache = LRUCache(OVERRIDERS_CACHE_SIZE)
 
-    def __init__(self):
+    def __init__(self, profiler=None):
         super(BaseSchema, self).__init__(self.schema)
+        if profiler is None:
+            self._plan = self._get_plan()
+        else:
+            self._plan = fields.GenerationPlan(self.schema, profiler=profiler)
+
+    @classmethod
+    def _get_plan(cls):
+        plan = cls.__dict__.get('_compiled_plan')
+        if plan is None:
+            plan = fields.GenerationPlan(cls.schema)
+            cls._compiled_plan = plan
+
+        return plan
+
+    def generate(self, rng=None, **kwargs):
+        if not kwargs:
+            return self._plan.run(rng)
+
+        return self.override(self._plan.run(rng), **kwargs)
 
-    def generate(self, **kwargs):
-        generated = super(BaseSchema, self).generate()
-        extra = kwargs.pop('extra', {})
+    def override(self, generated, **kwargs):
+        extra = dict(kwargs.pop('extra', {}))
         extra.update(kwargs)
+        if not extra:
+            return generated
+
         overrider = self._build_overrider(extra)
 
         return self._override(generated, overrider)
 
+    def generate_raw(self, rng=None, **kwargs):
+        return encode_raw(self.generate(rng=rng, **kwargs))
+
+    def template(self, varying, rng=None, **kwargs):
+        return Template(self, varying, rng=rng, **kwargs)
+
+    def generate_batch(self, n, rng=None, varying=None, **kwargs):
+        if fields.numpy is None:
+            raise ImportError('numpy is required to generate batches')
+
+        if rng is None:
+            rng = fields.numpy.random.default_rng()
+
+        if varying is not None:
+            template = Template(self, varying,
+                                document=self._plan.run_batch(1, rng)[0],
+                                **kwargs)
+
+            return template.generate_batch(n, rng)
+
+        generated = self._plan.run_batch(n, rng)
+        extra = dict(kwargs.pop('extra', {}))
+        extra.update(kwargs)
+        if not extra:
+            return generated
+
+        overrider = self._build_overrider(extra)
+
+        return [self._override(g, overrider) for g in generated]
+
+    def iter_generate(self, n=None, chunk_size=None, rng=None, raw=False,
+                      varying=None, **kwargs):
+        if varying is not None:
+            template = Template(self, varying, rng=rng, **kwargs)
+
+            return template.iter_generate(n, chunk_size=chunk_size, rng=rng,
+                                          raw=raw)
+
+        extra = dict(kwargs.pop('extra', {}))
+        extra.update(kwargs)
+        run = self._plan.run
+        if extra:
+            overrider = self._build_overrider(extra)
+            generated = (self._override(run(rng), overrider)
+                         for _ in iter_count(n))
+        else:
+            generated = (run(rng) for _ in iter_count(n))
+        if raw:
+            generated = (encode_raw(g) for g in generated)
+        if chunk_size is not None:
+            generated = chunked(generated, chunk_size)
+
+        return generated
+
     def _build_overrider(self, overrider_kwargs):
-        infinite_defaultdict = lambda: defaultdict(infinite_defaultdict)
-        overrider = infinite_defaultdict()
-        keys_values = [(k.split('__'), v)
-                       for k, v in six.iteritems(overrider_kwargs)]
+        if not overrider_kwargs:
+            return []
 
-        for keys, value in keys_values:
-            cd = overrider
-            for k in keys[:-1]:
-                cd = cd[k]
+        keys = tuple(sorted(overrider_kwargs))
+        setters = self._overriders_cache.get(keys)
+        if setters is None:
+            setters = []
+            for k in keys:
+                path = k.split('__')
+                setters.append((path[:-1], path[-1], k))
 
-            cd[keys[-1]] = value
+            self._overriders_cache.set(keys, setters)
 
-        return dict(overrider)
+        return [(parents, key, overrider_kwargs[k])
+                for parents, key, k in setters]
 
     def _override(self, generated, overrider):
-        for k, v in six.iteritems(overrider):
+        for parents, key, value in overrider:
+            target = generated
+            for parent in parents:
+                child = target.get(parent)
+                if not isinstance(child, collections.Mapping):
+                    child = target[parent] = {}
+                target = child
+
+            if isinstance(value, collections.Mapping):
+                value = self._merge(target.get(key, {}), value)
+
+            target[key] = value
+
+        return generated
+
+    def _merge(self, generated, mapping):
+        for k, v in six.iteritems(mapping):
             if isinstance(v, collections.Mapping):
-                r = self._override(generated.get(k, {}), v)
-                generated[k] = r
-            else:
-                generated[k] = overrider[k]
+                v = self._merge(generated.get(k, {}), v)
+
+            generated[k] = v
 
         return generated
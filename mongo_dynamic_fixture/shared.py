@@ -0,0 +1,179 @@
+import errno
+import json
+import os
+import shutil
+import signal
+import tempfile
+
+import six
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from mongo_dynamic_fixture.snapshot import database_names
+
+
+SHARED_ENV = 'MONGO_DYNAMIC_FIXTURE_SHARED'
+LOCK_FILE_NAME = 'mongo_dynamic_fixture.lock'
+NAMESPACE_SEPARATOR = '__'
+
+
+def shared_mode():
+    return os.environ.get(SHARED_ENV, '').lower() not in ('', '0', 'false')
+
+
+def default_lock_path():
+    return os.path.join(tempfile.gettempdir(), LOCK_FILE_NAME)
+
+
+def worker_namespace(pid=None):
+    return 'w%d%s' % (pid or os.getpid(), NAMESPACE_SEPARATOR)
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+
+    return True
+
+
+class LockFile(object):
+
+    def __init__(self, path):
+        if fcntl is None:  # pragma: no cover
+            raise ImportError('Sharing a mongo instance requires fcntl')
+        self._path = path
+        self._file = None
+
+    @property
+    def path(self):
+        return self._path
+
+    def __enter__(self):
+        self._file = open(self._path, 'a+')
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+    def read(self):
+        self._file.seek(0)
+        content = self._file.read()
+        if not content:
+            return {}
+
+        return json.loads(content)
+
+    def write(self, state):
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(json.dumps(state))
+        self._file.flush()
+
+
+class SharedInstance(object):
+
+    def __init__(self, box_factory, lock_path=None, namespace=None):
+        self._box_factory = box_factory
+        self._lock = LockFile(lock_path or default_lock_path())
+        self._namespace = namespace or worker_namespace()
+        self._pid = os.getpid()
+        self._box = None
+        self._port = None
+        self.attach()
+
+    @property
+    def namespace(self):
+        return self._namespace
+
+    @property
+    def port(self):
+        return self._port
+
+    @property
+    def owner(self):
+        return self._box is not None
+
+    def attach(self):
+        with self._lock:
+            state = self._lock.read()
+            if not state or not pid_alive(state['pid']):
+                self._box = self._box_factory()
+                self._box.start()
+                state = {'port': self._box.port,
+                         'pid': self._box.process.pid,
+                         'db_path': self._box.db_path,
+                         'clients': []}
+            clients = [pid for pid in state['clients'] if pid_alive(pid)]
+            clients.append(self._pid)
+            state['clients'] = clients
+            self._lock.write(state)
+            self._port = state['port']
+
+    def detach(self):
+        with self._lock:
+            state = self._lock.read()
+            if not state:
+                return
+            clients = [pid for pid in state['clients']
+                       if pid != self._pid and pid_alive(pid)]
+            if clients:
+                state['clients'] = clients
+                self._lock.write(state)
+            else:
+                self._stop(state)
+                self._lock.write({})
+
+    def _stop(self, state):
+        if self._box is not None and self._box.running():
+            self._box.stop()
+        elif pid_alive(state['pid']):
+            os.kill(state['pid'], signal.SIGKILL)
+            shutil.rmtree(state['db_path'], ignore_errors=True)
+
+
+class NamespacedClient(object):
+
+    def __init__(self, client, namespace):
+        self._client = client
+        self._namespace = namespace
+
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def namespace(self):
+        return self._namespace
+
+    def __getitem__(self, name):
+        return self._client[self._namespace + name]
+
+    def __getattr__(self, name):
+        if name.startswith('_') or hasattr(type(self._client), name):
+            return getattr(self._client, name)
+
+        return self[name]
+
+    def get_database(self, name, *args, **kwargs):
+        return self._client.get_database(self._namespace + name,
+                                         *args, **kwargs)
+
+    def database_names(self):
+        return [name[len(self._namespace):]
+                for name in database_names(self._client)
+                if name.startswith(self._namespace)]
+
+    list_database_names = database_names
+
+    def drop_database(self, name_or_database):
+        if isinstance(name_or_database, six.string_types):
+            name_or_database = self._namespace + name_or_database
+        self._client.drop_database(name_or_database)
@@ -0,0 +1,145 @@
+try:
+    from bson.codec_options import CodecOptions
+    from bson.raw_bson import RawBSONDocument
+except ImportError:  # pragma: no cover
+    RawBSONDocument = None
+
+
+SYSTEM_DATABASES = ('admin', 'config', 'local')
+INDEX_INFO_KEYS = ('key', 'ns', 'v')
+
+
+def database_names(client):
+    if hasattr(client, 'list_database_names'):
+        names = client.list_database_names()
+    else:
+        names = client.database_names()
+
+    return [name for name in names if name not in SYSTEM_DATABASES]
+
+
+def collection_names(db):
+    if hasattr(db, 'list_collection_names'):
+        names = db.list_collection_names()
+    else:
+        names = db.collection_names()
+
+    return [name for name in names if not name.startswith('system.')]
+
+
+def collection_hashes(db, names):
+    if not names:
+        return {}
+
+    return db.command('dbHash', collections=names)['collections']
+
+
+def raw_collection(collection):
+    if RawBSONDocument is None:
+        return collection
+
+    return collection.with_options(
+        codec_options=CodecOptions(document_class=RawBSONDocument))
+
+
+def purge(client):
+    for db_name in database_names(client):
+        db = client[db_name]
+        for name in collection_names(db):
+            db.drop_collection(name)
+
+
+class CollectionSnapshot(object):
+
+    def __init__(self, documents, indexes, md5):
+        self._documents = documents
+        self._indexes = indexes
+        self._md5 = md5
+
+    @property
+    def documents(self):
+        return self._documents
+
+    @property
+    def indexes(self):
+        return self._indexes
+
+    @property
+    def md5(self):
+        return self._md5
+
+    @classmethod
+    def take(cls, collection, md5):
+        documents = list(raw_collection(collection).find())
+        indexes = [
+            (info['key'], dict((k, v) for k, v in info.items()
+                               if k not in INDEX_INFO_KEYS), name)
+            for name, info in collection.index_information().items()
+            if name != '_id_']
+
+        return cls(documents, indexes, md5)
+
+    def restore(self, collection):
+        collection.drop()
+        for keys, options, name in self.indexes:
+            collection.create_index(keys, name=name, **options)
+        if self.documents:
+            if hasattr(collection, 'insert_many'):
+                raw_collection(collection).insert_many(self.documents)
+            else:
+                collection.insert(self.documents)
+
+
+class Snapshot(object):
+
+    def __init__(self, collections):
+        self._collections = collections
+
+    @property
+    def collections(self):
+        return self._collections
+
+    def __len__(self):
+        return len(self._collections)
+
+    @classmethod
+    def take(cls, client):
+        collections = {}
+        for db_name in database_names(client):
+            db = client[db_name]
+            names = collection_names(db)
+            hashes = collection_hashes(db, names)
+            for name in names:
+                collections[(db_name, name)] = CollectionSnapshot.take(
+                    db[name], hashes.get(name))
+
+        return cls(collections)
+
+    def changed(self, client):
+        changed = set()
+        existing = set()
+        for db_name in database_names(client):
+            db = client[db_name]
+            names = collection_names(db)
+            hashes = collection_hashes(db, names)
+            for name in names:
+                existing.add((db_name, name))
+                snapshot = self.collections.get((db_name, name))
+                if snapshot is None or snapshot.md5 != hashes.get(name):
+                    changed.add((db_name, name))
+
+        return changed.union(set(self.collections) - existing)
+
+    def restore(self, client, changed=None):
+        if changed is None:
+            changed = self.changed(client)
+
+        for db_name, name in changed:
+            collection = client[db_name][name]
+            snapshot = self.collections.get((db_name, name))
+            if snapshot is None:
+                collection.drop()
+            else:
+                snapshot.restore(collection)
+
+        return changed
@@ -0,0 +1,160 @@
+import random
+import collections
+
+import six
+
+from mongo_dynamic_fixture import fields
+from mongo_dynamic_fixture.encoding import encode_raw
+from mongo_dynamic_fixture.exceptions import InvalidPathException
+from mongo_dynamic_fixture.exceptions import NotGeneratedException
+from mongo_dynamic_fixture.utils import chunked
+from mongo_dynamic_fixture.utils import iter_count
+
+
+def varying_tree(varying):
+    tree = {}
+    for path in varying:
+        parts = path.split('.')
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is None:
+                break
+        else:
+            node[parts[-1]] = None
+
+    return tree
+
+
+class Template(object):
+
+    def __init__(self, schema, varying, document=None, rng=None, **kwargs):
+        extra = dict(kwargs.pop('extra', {}))
+        extra.update(kwargs)
+        if document is None:
+            document = schema.generate(rng=rng, extra=extra)
+        else:
+            document = schema.override(document, extra=extra)
+        self._schema = schema
+        self._varying = sorted(set(varying))
+        self._document = document
+        self._steps = []
+        self._containers_count = 0
+        self._compile(schema.schema, varying_tree(self._varying), 0, None)
+        paths = [path.split('.') for path in self._varying]
+        self._overrider = [
+            (parents, key, value) for parents, key, value in
+            schema._build_overrider(extra)
+            if any(self._overlaps(parents + [key], p) for p in paths)]
+
+    @property
+    def schema(self):
+        return self._schema
+
+    @property
+    def varying(self):
+        return self._varying
+
+    @property
+    def document(self):
+        return self._document
+
+    @staticmethod
+    def _overlaps(a, b):
+        n = min(len(a), len(b))
+        return a[:n] == b[:n]
+
+    def _compile(self, schema, tree, parent, path):
+        for k, subtree in sorted(six.iteritems(tree)):
+            key_path = k if path is None else '%s.%s' % (path, k)
+            if k not in schema:
+                raise InvalidPathException(
+                    '%s is not a path of the schema' % key_path)
+            v = schema[k]
+            if subtree is None:
+                if not isinstance(v, fields.BaseField):
+                    v = fields.ObjectField(v)
+                self._steps.append((parent, k, v, v._compile()))
+                continue
+
+            if isinstance(v, fields.ObjectField):
+                v = v.schema
+            elif isinstance(v, fields.BaseField):
+                raise InvalidPathException(
+                    '%s has no nested fields' % key_path)
+            self._containers_count += 1
+            self._steps.append((parent, k, None, None))
+            self._compile(v, subtree, self._containers_count, key_path)
+
+    def generate(self, rng=None):
+        if rng is None:
+            rng = random
+
+        containers = [dict(self._document)]
+        for parent, key, _, generate in self._steps:
+            target = containers[parent]
+            if generate is None:
+                child = None if target is None else target.get(key)
+                if isinstance(child, collections.Mapping):
+                    child = target[key] = dict(child)
+                else:
+                    child = None
+                containers.append(child)
+            elif target is not None:
+                try:
+                    target[key] = generate(rng)
+                except NotGeneratedException:
+                    target.pop(key, None)
+
+        if self._overrider:
+            self._schema._override(containers[0], self._overrider)
+
+        return containers[0]
+
+    def generate_raw(self, rng=None):
+        return encode_raw(self.generate(rng=rng))
+
+    def generate_batch(self, n, rng=None):
+        if fields.numpy is None:
+            raise ImportError('numpy is required to generate batches')
+
+        if rng is None:
+            rng = fields.numpy.random.default_rng()
+
+        containers = [[dict(self._document) for _ in range(n)]]
+        for parent, key, field, _ in self._steps:
+            targets = containers[parent]
+            if field is None:
+                children = []
+                for target in targets:
+                    child = None if target is None else target.get(key)
+                    if isinstance(child, collections.Mapping):
+                        child = target[key] = dict(child)
+                    else:
+                        child = None
+                    children.append(child)
+                containers.append(children)
+                continue
+
+            for target, value in zip(targets, field.generate_batch(n, rng)):
+                if target is None:
+                    continue
+                if value is fields.NOT_GENERATED:
+                    target.pop(key, None)
+                else:
+                    target[key] = value
+
+        if self._overrider:
+            for document in containers[0]:
+                self._schema._override(document, self._overrider)
+
+        return containers[0]
+
+    def iter_generate(self, n=None, chunk_size=None, rng=None, raw=False):
+        generated = (self.generate(rng) for _ in iter_count(n))
+        if raw:
+            generated = (encode_raw(g) for g in generated)
+        if chunk_size is not None:
+            generated = chunked(generated, chunk_size)
+
+        return generated
@@ -1,8 +1,18 @@
 import atexit
 
+import pymongo
 from mongobox import MongoBox
 from mongobox import unittest
 
+from mongo_dynamic_fixture.fields import reset_references
+from mongo_dynamic_fixture.registry import purge_collections
+from mongo_dynamic_fixture.registry import registry
+from mongo_dynamic_fixture.shared import NamespacedClient
+from mongo_dynamic_fixture.shared import SharedInstance
+from mongo_dynamic_fixture.shared import shared_mode
+from mongo_dynamic_fixture.snapshot import purge
+from mongo_dynamic_fixture.snapshot import Snapshot
+
 
 class MongoTemporaryInstance(object):
 
@@ -11,7 +21,10 @@ class MongoTemporaryInstance(object):
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
-            cls._instance = cls()
+            if cls is MongoTemporaryInstance and shared_mode():
+                cls._instance = SharedMongoTemporaryInstance()
+            else:
+                cls._instance = cls()
             atexit.register(cls._instance.shutdown)
 
         return cls._instance
@@ -28,17 +41,101 @@ class MongoTemporaryInstance(object):
         self._box.stop()
 
 
+class SharedMongoTemporaryInstance(MongoTemporaryInstance):
+
+    def __init__(self, lock_path=None, namespace=None):
+        self._shared = SharedInstance(MongoBox, lock_path=lock_path,
+                                      namespace=namespace)
+
+    @property
+    def namespace(self):
+        return self._shared.namespace
+
+    @property
+    def conn(self):
+        return self._connect
+
+    def _connect(self):
+        return NamespacedClient(pymongo.MongoClient(port=self._shared.port),
+                                self._shared.namespace)
+
+    def shutdown(self):  # pragma: no cover
+        client = self._connect()
+        for db_name in client.database_names():
+            client.drop_database(db_name)
+        self._shared.detach()
+
+
 class MongoTestCase(unittest.MongoTestCase):
 
+    _baseline = None
+    track_writes = False
+    purge_workers = None
+
     def __init__(self, *args, **kwargs):
         super(MongoTestCase, self).__init__(*args, **kwargs)
         mongo_temp_instance = MongoTemporaryInstance.get_instance()
         self._conn = mongo_temp_instance.conn()
 
+    @classmethod
+    def setUpClass(cls):
+        super(MongoTestCase, cls).setUpClass()
+        if cls.setUpBaseline.__func__ is not \
+                MongoTestCase.setUpBaseline.__func__:
+            mongo_client = MongoTemporaryInstance.get_instance().conn()
+            cls.setUpBaseline(mongo_client)
+            cls._baseline = Snapshot.take(mongo_client)
+            registry.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls._baseline is not None:
+            cls._baseline = None
+            purge(MongoTemporaryInstance.get_instance().conn())
+            reset_references()
+        super(MongoTestCase, cls).tearDownClass()
+
+    @classmethod
+    def setUpBaseline(cls, mongo_client):
+        pass
+
     @property
     def mongo_client(self):
         return self._conn
 
+    @property
+    def raw_client(self):
+        if isinstance(self._conn, NamespacedClient):
+            return self._conn.client
+
+        return self._conn
+
+    def restore_baseline(self):
+        if not self.track_writes:
+            return self._baseline.restore(self.mongo_client)
+
+        written = registry.pop()
+        changed = set()
+        for db_name, coll_name in self._baseline.collections:
+            key = (self.mongo_client[db_name].name, coll_name)
+            if key in written:
+                written.discard(key)
+                changed.add((db_name, coll_name))
+        self._baseline.restore(self.mongo_client, changed)
+        purge_collections(self.raw_client, written)
+
+        return changed
+
+    def purge_written(self, drop=True, workers=None):
+        return purge_collections(self.raw_client, registry.pop(), drop=drop,
+                                 workers=workers)
+
     def tearDown(self):
         super(MongoTestCase, self).tearDown()
-        self.purge_database()
+        if self._baseline is not None:
+            self.restore_baseline()
+        elif self.track_writes:
+            self.purge_written(workers=self.purge_workers)
+        else:
+            self.purge_database()
+        reset_references()
@@ -0,0 +1,68 @@
+import threading
+
+try:
+    from math import gcd
+except ImportError:  # pragma: no cover
+    from fractions import gcd
+
+from six.moves import range
+
+from mongo_dynamic_fixture.exceptions import UniqueValuesExhaustedException
+
+
+MULTIPLIER_RATIO = 0.6180339887498949
+INCREMENT_RATIO = 0.3819660112501051
+
+
+def coprime(n, size):
+    n = max(n, 1)
+    while gcd(n, size) != 1:
+        n += 1
+
+    return n
+
+
+class UniqueSequence(object):
+
+    def __init__(self, size):
+        self._size = size
+        self._multiplier = coprime(int(size * MULTIPLIER_RATIO), size)
+        self._increment = int(size * INCREMENT_RATIO)
+        self._counter = 0
+        self._stride = 1
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def counter(self):
+        return self._counter
+
+    def seek(self, offset, stride=1):
+        with self._lock:
+            self._counter = offset
+            self._stride = stride
+
+    def advance(self, counter):
+        with self._lock:
+            self._counter = max(self._counter, counter)
+
+    def permute(self, index):
+        return (self._multiplier * index + self._increment) % self._size
+
+    def next(self):
+        return self.take(1)[0]
+
+    def take(self, n):
+        with self._lock:
+            start = self._counter
+            stop = start + n * self._stride
+            if stop - self._stride >= self._size:
+                raise UniqueValuesExhaustedException(
+                    'All the %d unique values have been generated'
+                    % self._size)
+            self._counter = stop
+
+        return [self.permute(i) for i in range(start, stop, self._stride)]
@@ -0,0 +1,57 @@
+import threading
+import itertools
+import collections
+
+from six.moves import range
+
+
+def iter_count(n=None):
+    return itertools.count() if n is None else range(n)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def split_count(n, size):
+    for start in range(0, n, size):
+        yield min(size, n - start)
+
+
+class LRUCache(object):
+
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                return default
+
+            self._items[key] = value
+
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
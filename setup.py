@@ -16,6 +16,8 @@ requires = ['pymongo==3.0.3',
             'mongobox==0.1.6',
             'six==1.10.0']
 
+extras_require = {'numpy': ['numpy>=1.17']}
+
 classifiers = [
     'Development Status :: 4 - Beta',
     'Intended Audience :: Developers',
@@ -58,4 +60,5 @@ setup(name=title,
       package_data={'': ['LICENSE']},
       include_package_data=True,
       install_requires=requires,
+      extras_require=extras_require,
       classifiers=classifiers)
@@ -0,0 +1,95 @@
+import unittest
+
+try:
+    import asyncio
+    from mongo_dynamic_fixture.aio import AG
+    from mongo_dynamic_fixture.aio import AG_many
+    from mongo_dynamic_fixture.aio import AsyncFixture
+except (ImportError, SyntaxError):
+    asyncio = None
+
+from tests import SimpleTestSchema
+
+
+class InsertManyResult(object):
+
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+
+class AsyncDatabase(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class AsyncCollection(object):
+
+    def __init__(self, delay=0.01):
+        self.database = AsyncDatabase('db_test')
+        self.name = 'coll_test'
+        self.delay = delay
+        self.documents = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def insert_one(self, document):
+        return self.insert_many([document])
+
+    def insert_many(self, documents, ordered=True):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        result = asyncio.Future()
+
+        def done(_):
+            self.in_flight -= 1
+            for document in documents:
+                document.setdefault('_id', len(self.documents))
+                self.documents.append(document)
+            result.set_result(InsertManyResult([d['_id'] for d in documents]))
+
+        asyncio.ensure_future(asyncio.sleep(self.delay)).add_done_callback(
+            done)
+
+        return result
+
+
+@unittest.skipIf(asyncio is None, 'asyncio is not available')
+class AsyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.conn = AsyncCollection()
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def test_fixture_insert_many(self):
+        data = [{'_id': i, 'key': 'value'} for i in range(25)]
+        fixture = AsyncFixture(self.conn, iter(data))
+        inserted_ids = self.loop.run_until_complete(
+            fixture.insert_many(batch_size=2, max_in_flight=3))
+
+        self.assertEqual(inserted_ids, list(range(25)))
+        self.assertEqual(sorted(self.conn.documents, key=lambda d: d['_id']),
+                         data)
+        self.assertEqual(self.conn.max_in_flight, 3)
+
+    def test_AG(self):
+        actual_data = self.loop.run_until_complete(
+            AG(self.conn, SimpleTestSchema, _id='123'))
+
+        self.assertEqual(actual_data['_id'], '123')
+        self.assertEqual(self.conn.documents, [actual_data])
+
+    def test_AG_many(self):
+        inserted_ids = self.loop.run_until_complete(
+            AG_many(self.conn, SimpleTestSchema, count=25, batch_size=10,
+                    nest_3__double=999.999))
+
+        self.assertEqual(len(inserted_ids), 25)
+        self.assertEqual(len(self.conn.documents), 25)
+        self.assertTrue(all([d['nest_3']['double'] == 999.999
+                             for d in self.conn.documents]))
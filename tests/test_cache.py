@@ -0,0 +1,205 @@
+import os
+import time
+import random
+import shutil
+import tempfile
+import unittest
+import datetime
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from bson import BSON
+
+from tests import SimpleTestSchema
+from mongo_dynamic_fixture.cache import DatasetCache
+from mongo_dynamic_fixture.cache import fingerprint
+from mongo_dynamic_fixture.cache import iter_documents
+from mongo_dynamic_fixture.encoding import RawBSONDocument
+from mongo_dynamic_fixture.fields import IntegerField
+from mongo_dynamic_fixture.fields import ReferenceField
+from mongo_dynamic_fixture.fields import StringField
+from mongo_dynamic_fixture.parallel import generate_parallel
+from mongo_dynamic_fixture.schema import BaseSchema
+
+
+def make_schema(schema):
+    return type('CacheTestSchema', (BaseSchema,), {'schema': schema})
+
+
+def decode(documents):
+    return [dict(document.items()) for document in documents]
+
+
+def decode_all(documents):
+    return [BSON(document.raw).decode() if hasattr(document, 'raw')
+            else document for document in documents]
+
+
+class FingerprintTestCase(unittest.TestCase):
+
+    def test_stable(self):
+        schema = {'integer': IntegerField(), 'nest': {'string': StringField()}}
+        self.assertEqual(fingerprint(make_schema(schema)),
+                         fingerprint(make_schema(dict(schema))))
+        SimpleTestSchema().generate()
+        self.assertEqual(fingerprint(SimpleTestSchema),
+                         fingerprint(SimpleTestSchema))
+
+    def test_parameters(self):
+        fingerprints = set(fingerprint(make_schema(schema)) for schema in [
+            {'integer': IntegerField()},
+            {'integer': IntegerField(max_value=10)},
+            {'integer': IntegerField(null=True, null_prob=0.1)},
+            {'integer': StringField()},
+            {'other': IntegerField()},
+            {'nest': {'integer': IntegerField()}},
+        ])
+        self.assertEqual(len(fingerprints), 6)
+
+
+class DatasetCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = DatasetCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_key(self):
+        key = self.cache.key(SimpleTestSchema, 10, 42)
+        self.assertEqual(key, self.cache.key(SimpleTestSchema, 10, 42))
+        self.assertNotEqual(key, self.cache.key(SimpleTestSchema, 11, 42))
+        self.assertNotEqual(key, self.cache.key(SimpleTestSchema, 10, 43))
+        self.assertNotEqual(
+            self.cache.key(SimpleTestSchema, 10, 42,
+                           created=datetime.datetime(2015, 1, 1)),
+            self.cache.key(SimpleTestSchema, 10, 42,
+                           created=datetime.datetime(2015, 1, 2)))
+        self.assertEqual(
+            self.cache.key(SimpleTestSchema, 10, 42, nest_3__double=1.5),
+            self.cache.key(SimpleTestSchema, 10, 42,
+                           extra={'nest_3__double': 1.5}))
+        self.assertNotEqual(key, self.cache.key(SimpleTestSchema, 10, 42,
+                                                chunk_size=5))
+        self.assertNotEqual(
+            self.cache.key(SimpleTestSchema, 10, 42, chunk_size=5),
+            self.cache.key(SimpleTestSchema, 10, 42, chunk_size=6))
+
+    def test_N_iter(self):
+        documents = decode(self.cache.N_iter(SimpleTestSchema, 25, 42,
+                                             nest_3__double=1.5))
+        self.assertEqual(len(documents), 25)
+        self.assertTrue(all([d['nest_3']['double'] == 1.5
+                             for d in documents]))
+        self.assertIn(self.cache.key(SimpleTestSchema, 25, 42,
+                                     nest_3__double=1.5), self.cache)
+
+        with mock.patch.object(SimpleTestSchema, 'iter_generate') as generate:
+            cached = decode(self.cache.N_iter(SimpleTestSchema, 25, 42,
+                                              nest_3__double=1.5))
+            self.assertFalse(generate.called)
+        self.assertEqual(cached, documents)
+
+        if RawBSONDocument is not None:
+            path = self.cache.path(self.cache.key(
+                SimpleTestSchema, 25, 42, nest_3__double=1.5))
+            self.assertTrue(all([isinstance(d, RawBSONDocument)
+                                 for d in iter_documents(path)]))
+
+    def test_N_iter_parallel(self):
+        serial = decode_all(self.cache.N_iter(SimpleTestSchema, 10, 42))
+        parallel = decode_all(self.cache.N_iter(SimpleTestSchema, 10, 42,
+                                                workers=2, chunk_size=5))
+        self.assertEqual(len(self.cache.entries()), 2)
+        for d in serial + parallel:
+            del d['_id']
+        self.assertEqual(serial, list(SimpleTestSchema().iter_generate(
+            10, rng=random.Random(42))))
+        self.assertEqual(parallel, [
+            d for chunk in generate_parallel(SimpleTestSchema, 10, seed=42,
+                                             workers=1, chunk_size=5)
+            for d in chunk])
+        self.assertEqual(
+            decode(self.cache.N_iter(SimpleTestSchema, 10, 42, workers=3,
+                                     chunk_size=5)),
+            decode(self.cache.N_iter(SimpleTestSchema, 10, 42, workers=2,
+                                     chunk_size=5)))
+        self.assertEqual(len(self.cache.entries()), 2)
+
+    def test_N_iter_unique(self):
+        schema_cls = make_schema({
+            'id': IntegerField(unique=True, max_value=10 ** 6)})
+        sequence = schema_cls().sequences()[0]
+
+        def ids(documents):
+            return [document['id'] for document in documents]
+
+        stored = ids(self.cache.N_iter(schema_cls, 10, 42))
+        self.assertEqual(sequence.counter, 10)
+        other = ids(self.cache.N_iter(schema_cls, 10, 42))
+        self.assertTrue(set(stored).isdisjoint(other))
+        self.assertEqual(len(self.cache.entries()), 2)
+
+        sequence.seek(0)
+        self.assertEqual(ids(self.cache.N_iter(schema_cls, 10, 42)), stored)
+        self.assertEqual(sequence.counter, 10)
+        self.assertNotIn(schema_cls().generate()['id'], stored)
+
+    def test_N_iter_references(self):
+        schema_cls = make_schema({'parent': ReferenceField(SimpleTestSchema)})
+        with self.assertRaises(ValueError):
+            self.cache.N_iter(schema_cls, 10, 42)
+
+    def test_N_iter_empty(self):
+        self.assertEqual(list(self.cache.N_iter(SimpleTestSchema, 0, 42)), [])
+
+    def test_G_many(self):
+        conn = mock.MagicMock()
+        conn.insert_many.side_effect = lambda batch, **kwargs: mock.Mock(
+            inserted_ids=[d['_id'] for d in batch])
+        inserted_ids = self.cache.G_many(conn, SimpleTestSchema, 25, 42,
+                                         batch_size=10)
+        self.assertEqual(len(inserted_ids), 25)
+        self.assertEqual(conn.insert_many.call_count, 3)
+
+    def test_G_many_write_options(self):
+        conn = mock.MagicMock()
+        conn.with_options.return_value = conn
+        conn.insert_many.side_effect = lambda batch, **kwargs: mock.Mock(
+            inserted_ids=[d['_id'] for d in batch])
+        self.cache.G_many(conn, SimpleTestSchema, 5, 42, retries=2,
+                          write_concern={'w': 2},
+                          bypass_document_validation=True)
+        self.assertEqual(conn.with_options.call_count, 1)
+        self.assertEqual(
+            conn.with_options.call_args[1]['write_concern'].document,
+            {'w': 2})
+        self.assertTrue(conn.insert_many.call_args[1][
+            'bypass_document_validation'])
+        self.assertNotIn(self.cache.key(SimpleTestSchema, 5, 42, retries=2),
+                         self.cache)
+        self.assertIn(self.cache.key(SimpleTestSchema, 5, 42), self.cache)
+
+    def test_evict_age(self):
+        self.cache.N_iter(SimpleTestSchema, 10, 1)
+        self.cache.N_iter(SimpleTestSchema, 10, 2)
+        cache = DatasetCache(self.directory, max_age=60)
+        self.assertEqual(cache.evict(now=time.time() + 30), [])
+        self.assertEqual(len(cache.evict(now=time.time() + 90)), 2)
+        self.assertEqual(cache.entries(), [])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_evict_size(self):
+        self.cache.N_iter(SimpleTestSchema, 10, 1)
+        size = self.cache.size()
+        path = self.cache.path(self.cache.key(SimpleTestSchema, 10, 1))
+        os.utime(path, (time.time() - 10, time.time() - 10))
+
+        cache = DatasetCache(self.directory, max_size=size + size // 2)
+        cache.N_iter(SimpleTestSchema, 10, 2)
+        self.assertNotIn(self.cache.key(SimpleTestSchema, 10, 1), cache)
+        self.assertIn(self.cache.key(SimpleTestSchema, 10, 2), cache)
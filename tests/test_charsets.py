@@ -0,0 +1,73 @@
+import random
+import string
+import unittest
+
+import six
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mongo_dynamic_fixture.charsets import CharsetSampler
+
+
+class CharsetSamplerTestCase(unittest.TestCase):
+
+    def test_for_charset(self):
+        charset = string.ascii_letters + string.digits
+        self.assertIs(CharsetSampler.for_charset(charset),
+                      CharsetSampler.for_charset(charset))
+        self.assertIsNot(CharsetSampler.for_charset(charset),
+                         CharsetSampler.for_charset(string.digits))
+
+    def test_sample(self):
+        charset = '!@#$%^&*()_'
+        sampler = CharsetSampler(charset)
+        for length in [0, 1, 10, 16, 100]:
+            sampled = sampler.sample(length)
+            self.assertEqual(len(sampled), length)
+            self.assertTrue(all([s in charset for s in sampled]))
+
+        self.assertEqual(set(sampler.sample(1000)), set(charset))
+
+    def test_sample_with_rng(self):
+        sampler = CharsetSampler(string.ascii_letters)
+        rng = random.Random(42)
+        sampler.sample(100)
+        generated = sampler.sample(100, random.Random(42))
+        self.assertEqual(sampler.sample(100, rng), generated)
+        self.assertEqual(len(sampler.sample(100000, rng)), 100000)
+
+    def test_sample_stateless(self):
+        sampler = CharsetSampler(string.ascii_letters + string.digits)
+        rng = random.Random(42)
+        generated = [sampler.sample(10, rng) for _ in range(5)]
+        rng.seed(42)
+        self.assertEqual([sampler.sample(10, rng) for _ in range(5)],
+                         generated)
+        rng.seed(42)
+        sampler.sample(3, random.Random(0))
+        self.assertEqual(sampler.sample(10, rng), generated[0])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_sample_with_numpy_rng(self):
+        charset = '!@#$%^&*()_'
+        sampler = CharsetSampler(charset)
+        generated = [sampler.sample(100, numpy.random.default_rng(42))
+                     for _ in range(2)]
+        self.assertEqual(generated[0], generated[1])
+        self.assertEqual(len(generated[0]), 100)
+        self.assertTrue(all([s in charset for s in generated[0]]))
+
+    def test_sample_large_charset(self):
+        charset = u''.join([six.unichr(i) for i in range(0x400, 0x520)])
+        sampled = CharsetSampler(charset).sample(100)
+        self.assertEqual(len(sampled), 100)
+        self.assertTrue(all([s in charset for s in sampled]))
+
+        if numpy is not None:
+            sampled = CharsetSampler(charset).sample(
+                100, numpy.random.default_rng())
+            self.assertEqual(len(sampled), 100)
+            self.assertTrue(all([s in charset for s in sampled]))
@@ -0,0 +1,70 @@
+import random
+import unittest
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mongo_dynamic_fixture.distributions import AliasTable
+from mongo_dynamic_fixture.distributions import Exponential
+from mongo_dynamic_fixture.distributions import Normal
+from mongo_dynamic_fixture.distributions import Zipf
+
+
+class AliasTableTestCase(unittest.TestCase):
+
+    weights = [1, 2, 3, 4, 0]
+
+    def assertFrequencies(self, samples):
+        counts = collections.Counter(samples)
+        total = float(sum(self.weights))
+        for i, weight in enumerate(self.weights):
+            self.assertAlmostEqual(counts[i] / float(len(samples)),
+                                   weight / total, delta=0.01)
+
+    def test_invalid_weights(self):
+        for weights in [[-1, 2, 0], [0, 0, 0], []]:
+            with self.assertRaises(ValueError):
+                AliasTable(weights)
+
+    def test_sample(self):
+        table = AliasTable(self.weights)
+        self.assertEqual(len(table), 5)
+        rng = random.Random(42)
+        self.assertFrequencies([table.sample(rng) for _ in range(100000)])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_sample_batch(self):
+        table = AliasTable(self.weights)
+        rng = numpy.random.default_rng(42)
+        self.assertFrequencies(table.sample_batch(100000, rng).tolist())
+
+
+class DistributionTestCase(unittest.TestCase):
+
+    def test_zipf(self):
+        distribution = Zipf(exponent=2)
+        self.assertTrue(distribution.discrete)
+        self.assertEqual(distribution.weights(3), [1.0, 0.25, 1.0 / 9])
+        with self.assertRaises(NotImplementedError):
+            distribution.sample(random)
+
+    def test_normal(self):
+        distribution = Normal(mean=1, stddev=2)
+        self.assertFalse(distribution.discrete)
+        weights = distribution.weights(3)
+        self.assertEqual(weights[0], weights[2])
+        self.assertEqual(weights[1], 1.0)
+        samples = [distribution.sample(random.Random(i)) for i in range(1000)]
+        self.assertAlmostEqual(sum(samples) / 1000, 1, delta=0.2)
+
+    def test_exponential(self):
+        distribution = Exponential(rate=2, origin=10)
+        self.assertFalse(distribution.discrete)
+        weights = distribution.weights(12)
+        self.assertEqual(weights[:11], [1.0] * 11)
+        samples = [distribution.sample(random.Random(i)) for i in range(1000)]
+        self.assertTrue(all([s >= 10 for s in samples]))
+        self.assertAlmostEqual(sum(samples) / 1000, 10.5, delta=0.1)
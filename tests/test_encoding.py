@@ -0,0 +1,22 @@
+import unittest
+
+from bson import BSON
+from bson import ObjectId
+
+from mongo_dynamic_fixture.encoding import encode_raw
+from mongo_dynamic_fixture.encoding import RawBSONDocument
+
+
+@unittest.skipIf(RawBSONDocument is None, 'pymongo>=3.2 is not installed')
+class EncodingTestCase(unittest.TestCase):
+
+    def test_encode_raw(self):
+        document = {'_id': '123', 'nest': {'key': [1, 2.5, 'value']}}
+        encoded = encode_raw(dict(document))
+        self.assertTrue(isinstance(encoded, RawBSONDocument))
+        self.assertEqual(encoded.raw, BSON.encode(document))
+        self.assertEqual(encoded['nest']['key'], [1, 2.5, 'value'])
+
+    def test_encode_raw_id(self):
+        encoded = encode_raw({'key': 'value'})
+        self.assertTrue(isinstance(encoded['_id'], ObjectId))
@@ -0,0 +1,82 @@
+import os
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+import bson
+from bson import json_util
+
+from tests import SimpleTestSchema
+from mongo_dynamic_fixture import N_iter
+from mongo_dynamic_fixture.export import export_jsonl
+from mongo_dynamic_fixture.export import export_dump
+from mongo_dynamic_fixture.encoding import RawBSONDocument
+from mongo_dynamic_fixture.indexes import Index
+
+
+class ExportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_export_jsonl(self):
+        path = os.path.join(self.directory, 'fixtures.jsonl')
+        data = list(N_iter(SimpleTestSchema, count=25))
+        count = export_jsonl(path, iter(data), chunk_size=10)
+
+        self.assertEqual(count, 25)
+        with open(path) as f:
+            exported = [json_util.loads(line) for line in f]
+        self.assertEqual(exported, data)
+
+    def test_export_jsonl_compress_threaded(self):
+        path = os.path.join(self.directory, 'fixtures.jsonl.gz')
+        data = list(N_iter(SimpleTestSchema, count=25))
+        count = export_jsonl(path, iter(data), compress=True, threaded=True,
+                             chunk_size=10)
+
+        self.assertEqual(count, 25)
+        with gzip.open(path) as f:
+            exported = [json_util.loads(line.decode('utf-8')) for line in f]
+        self.assertEqual(exported, data)
+
+    def test_export_dump(self):
+        data = list(N_iter(SimpleTestSchema, count=25))
+        count = export_dump(self.directory, 'db_test', 'coll_test', iter(data),
+                            chunk_size=10,
+                            indexes=[Index('nest-1.integer', unique=True)])
+
+        self.assertEqual(count, 25)
+        db_directory = os.path.join(self.directory, 'db_test')
+        with open(os.path.join(db_directory, 'coll_test.bson'), 'rb') as f:
+            self.assertEqual(bson.decode_all(f.read()), data)
+        with open(os.path.join(db_directory,
+                               'coll_test.metadata.json')) as f:
+            metadata = json.load(f)
+        self.assertEqual(metadata['collectionName'], 'coll_test')
+        self.assertEqual(metadata['indexes'][0]['ns'], 'db_test.coll_test')
+        self.assertEqual(metadata['indexes'][1],
+                         {'v': 2, 'key': {'nest-1.integer': 1},
+                          'name': 'nest-1.integer_1', 'unique': True,
+                          'ns': 'db_test.coll_test'})
+
+    @unittest.skipIf(RawBSONDocument is None, 'pymongo>=3.2 is not installed')
+    def test_export_dump_compress_threaded(self):
+        data = list(N_iter(SimpleTestSchema, count=25, raw=True))
+        count = export_dump(self.directory, 'db_test', 'coll_test', iter(data),
+                            compress=True, threaded=True, chunk_size=10)
+
+        self.assertEqual(count, 25)
+        db_directory = os.path.join(self.directory, 'db_test')
+        with gzip.open(os.path.join(db_directory, 'coll_test.bson.gz')) as f:
+            self.assertEqual(bson.decode_all(f.read()),
+                             [bson.decode_all(d.raw)[0] for d in data])
+        with gzip.open(os.path.join(db_directory,
+                                    'coll_test.metadata.json.gz')) as f:
+            metadata = json.loads(f.read().decode('utf-8'))
+        self.assertEqual(metadata['collectionName'], 'coll_test')
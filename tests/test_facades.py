@@ -1,9 +1,29 @@
+import random
 import string
 
 from tests import SimpleTestSchema
 from mongo_dynamic_fixture import N
+from mongo_dynamic_fixture import N_iter
 from mongo_dynamic_fixture import G
+from mongo_dynamic_fixture import G_many
 from mongo_dynamic_fixture.test import MongoTestCase
+from mongo_dynamic_fixture.schema import BaseSchema
+from mongo_dynamic_fixture.fields import IntegerField
+from mongo_dynamic_fixture.fields import StringField
+from mongo_dynamic_fixture.indexes import Index
+
+
+class IndexedTestSchema(BaseSchema):
+
+    schema = {
+        'integer': IntegerField(max_value=999, unique=True),
+        'string': StringField()
+    }
+
+    indexes = [
+        Index('integer', unique=True),
+        Index([('string', 1), ('integer', -1)])
+    ]
 
 
 class FacadesTestCase(MongoTestCase):
@@ -79,6 +99,25 @@ class FacadesTestCase(MongoTestCase):
         self.assertEqual(actual_data['nest-1']['nest-2']['string'], 'abcdef')
         self.assertEqual(actual_data['nest_3']['double'], 999.999)
 
+    def test_N_with_rng(self):
+        actual_data = [N(SimpleTestSchema, rng=random.Random(42), _id='123')
+                       for _ in range(2)]
+        self.assertEqual(actual_data[0], actual_data[1])
+        self.assertEqual(N(rng=random.Random(42), _id='123'), {'_id': '123'})
+
+    def test_N_iter_no_schema(self):
+        actual_data = list(N_iter(count=3, _id='123',
+                                  extra={'key-1': 'value-1'}))
+        expected_data = [{'_id': '123', 'key-1': 'value-1'}] * 3
+        self.assertEqual(actual_data, expected_data)
+
+    def test_N_iter_with_schema(self):
+        actual_data = list(N_iter(SimpleTestSchema, count=5, chunk_size=2,
+                                  nest_3__double=999.999))
+        self.assertEqual([len(chunk) for chunk in actual_data], [2, 2, 1])
+        self.assertTrue(all([data['nest_3']['double'] == 999.999
+                             for chunk in actual_data for data in chunk]))
+
     def test_G_no_schema_no_extra(self):
         actual_data = G(self.conn, _id='123', key_1='value-1', key_2='value-2')
         expected_data = {
@@ -158,3 +197,73 @@ class FacadesTestCase(MongoTestCase):
                 set(SimpleTestSchema.schema['nest-1']['nest-2'].keys()))
             self.assertEqual(data['nest-1']['nest-2']['string'], 'abcdef')
             self.assertEqual(data['nest_3']['double'], 999.999)
+
+    def test_G_many_no_schema(self):
+        inserted_ids = G_many(self.conn, count=3, key_1='value-1')
+
+        documents = list(self.conn.find())
+        self.assertEqual(len(documents), 3)
+        self.assertEqual(inserted_ids, [d['_id'] for d in documents])
+        self.assertTrue(all([d['key_1'] == 'value-1' for d in documents]))
+
+    def test_G_many_with_schema(self):
+        inserted_ids = G_many(self.conn, SimpleTestSchema, count=25,
+                              batch_size=10, ordered=False,
+                              nest_3__double=999.999,
+                              extra={'nest-1__integer': 10000})
+
+        documents = list(self.conn.find())
+        self.assertEqual(len(documents), 25)
+        self.assertEqual(set(inserted_ids), set([d['_id'] for d in documents]))
+
+        for data in documents:
+            self.assertEqual(
+                set(data.keys()),
+                set(SimpleTestSchema.schema.keys()).union(set(['_id'])))
+            self.assertEqual(data['nest-1']['integer'], 10000)
+            self.assertEqual(data['nest_3']['double'], 999.999)
+
+    def test_G_many_parallel(self):
+        inserted_ids = G_many(self.conn, SimpleTestSchema, count=25,
+                              batch_size=10, workers=2, seed=42,
+                              nest_3__double=999.999)
+
+        documents = list(self.conn.find())
+        self.assertEqual(len(documents), 25)
+        self.assertEqual(inserted_ids, [d['_id'] for d in documents])
+        self.assertTrue(all([d['nest_3']['double'] == 999.999
+                             for d in documents]))
+
+    def test_G_many_seed(self):
+        G_many(self.conn, SimpleTestSchema, count=5, seed=42)
+        documents = list(self.conn.find({}, {'_id': 0}))
+        self.assertEqual(documents, list(SimpleTestSchema().iter_generate(
+            5, rng=random.Random(42))))
+        self.assertTrue(all(['seed' not in d for d in documents]))
+
+    def test_G_many_indexes(self):
+        G_many(self.conn, IndexedTestSchema, count=25, batch_size=10)
+
+        indexes = self.conn.index_information()
+        self.assertEqual(indexes['integer_1']['unique'], True)
+        self.assertEqual(indexes['string_1_integer_-1']['key'],
+                         [('string', 1), ('integer', -1)])
+        self.assertEqual(self.conn.count(), 25)
+
+    def test_G_many_indexes_before(self):
+        G_many(self.conn, IndexedTestSchema, count=25, indexes='before')
+        self.assertIn('integer_1', self.conn.index_information())
+
+    def test_G_many_no_indexes(self):
+        G_many(self.conn, IndexedTestSchema, count=25, indexes=None)
+        self.assertEqual(list(self.conn.index_information()), ['_id_'])
+
+    def test_G_many_raw(self):
+        inserted_ids = G_many(self.conn, SimpleTestSchema, count=25,
+                              batch_size=10, raw=True, nest_3__double=999.999)
+
+        documents = list(self.conn.find())
+        self.assertEqual(len(documents), 25)
+        self.assertEqual(inserted_ids, [d['_id'] for d in documents])
+        self.assertTrue(all([d['nest_3']['double'] == 999.999
+                             for d in documents]))
@@ -7,6 +7,13 @@ try:
 except ImportError:
     from unittest import mock
 
+from bson.objectid import ObjectId
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from mongo_dynamic_fixture.fields import BaseField
 from mongo_dynamic_fixture.fields import IntegerField
 from mongo_dynamic_fixture.fields import DoubleField
@@ -14,11 +21,29 @@ from mongo_dynamic_fixture.fields import BooleanField
 from mongo_dynamic_fixture.fields import StringField
 from mongo_dynamic_fixture.fields import ArrayField
 from mongo_dynamic_fixture.fields import ObjectField
+from mongo_dynamic_fixture.fields import ObjectIdField
+from mongo_dynamic_fixture.fields import ReferenceField
+from mongo_dynamic_fixture.fields import NOT_GENERATED
+from mongo_dynamic_fixture.fields import reset_references
+from mongo_dynamic_fixture.schema import BaseSchema
+from mongo_dynamic_fixture.distributions import Exponential
+from mongo_dynamic_fixture.distributions import Normal
+from mongo_dynamic_fixture.distributions import Zipf
 from mongo_dynamic_fixture.exceptions import NotGeneratedException
+from mongo_dynamic_fixture.exceptions import UniqueValuesExhaustedException
+
+
+class ParentSchema(BaseSchema):
+
+    schema = {
+        'integer': IntegerField()
+    }
 
 
 FIELDS_RANDOM_MODULE = 'mongo_dynamic_fixture.fields.random'
 
+skip_if_no_numpy = unittest.skipIf(numpy is None, 'numpy is not installed')
+
 
 class BaseFieldTestCase(unittest.TestCase):
 
@@ -27,6 +52,39 @@ class BaseFieldTestCase(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             v.generate()
 
+    def test_rng(self):
+        fields = [IntegerField(), DoubleField(), BooleanField(), StringField(),
+                  ArrayField([IntegerField(), StringField()]),
+                  ObjectField({'integer': IntegerField(),
+                               'nest': {'string': StringField()}})]
+        for v in fields:
+            self.assertEqual([v.generate(random.Random(42)) for _ in range(5)],
+                             [v.generate(random.Random(42)) for _ in range(5)])
+
+    def test_slots(self):
+        fields = [IntegerField(choices=[1, 2]), DoubleField(), BooleanField(),
+                  StringField(charset='ab'), ObjectIdField(),
+                  ReferenceField(ParentSchema), ArrayField([IntegerField()]),
+                  ObjectField({'integer': IntegerField()})]
+        for v in fields:
+            self.assertFalse(hasattr(v, '__dict__'))
+            with self.assertRaises(AttributeError):
+                v.extra = True
+        self.assertEqual(fields[0].choices, [1, 2])
+        self.assertEqual(fields[3].charset, 'ab')
+
+    def test_custom_field_without_slots(self):
+        class CustomField(BaseField):
+
+            def __init__(self, value, **kwargs):
+                super(CustomField, self).__init__(**kwargs)
+                self.value = value
+
+            def generate_value(self, rng):
+                return self.value
+
+        self.assertEqual(CustomField(42, null_prob=0.5).generate(), 42)
+
 
 class IntegerFieldTestCase(unittest.TestCase):
 
@@ -136,6 +194,103 @@ class IntegerFieldTestCase(unittest.TestCase):
             mocked_random.choice = random.choice
             self.assertIn(v.generate(), choices)
 
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        rng = numpy.random.default_rng()
+        v = IntegerField(min_value=-10, max_value=10)
+        generated = v.generate_batch(100, rng)
+        self.assertEqual(len(generated), 100)
+        self.assertTrue(all([isinstance(i, int) and -10 <= i <= 10
+                             for i in generated]))
+
+        v = IntegerField(choices=[1, 5, 10])
+        self.assertTrue(all([i in [1, 5, 10]
+                             for i in v.generate_batch(100, rng)]))
+
+        v = IntegerField(min_value=100, max_value=0)
+        with self.assertRaises(ValueError):
+            v.generate_batch(100, rng)
+
+    @skip_if_no_numpy
+    def test_generate_batch_nullable_blankable_not_required(self):
+        rng = numpy.random.default_rng()
+        v = IntegerField(null=True, null_prob=1)
+        self.assertEqual(v.generate_batch(10, rng), [None] * 10)
+
+        v = IntegerField(null=True, null_prob=0, blank=True, blank_prob=1)
+        self.assertEqual(v.generate_batch(10, rng), [0] * 10)
+
+        v = IntegerField(required=False, not_present_prob=1)
+        self.assertEqual(v.generate_batch(10, rng), [NOT_GENERATED] * 10)
+
+        v = IntegerField(null=True, null_prob=0.3, blank=True, blank_prob=0.3,
+                         min_value=1, max_value=1)
+        generated = v.generate_batch(1000, rng)
+        self.assertEqual(set(generated), set([None, 0, 1]))
+
+    def test_unique(self):
+        v = IntegerField(min_value=10, max_value=1009, unique=True)
+        generated = [v.generate() for _ in range(1000)]
+        self.assertEqual(sorted(generated), list(range(10, 1010)))
+        with self.assertRaises(UniqueValuesExhaustedException):
+            v.generate()
+
+    def test_unique_choices(self):
+        v = IntegerField(choices=[1, 2, 3], unique=True)
+        self.assertEqual(sorted([v.generate() for _ in range(3)]), [1, 2, 3])
+
+    @skip_if_no_numpy
+    def test_generate_batch_unique(self):
+        v = IntegerField(max_value=999, unique=True)
+        rng = numpy.random.default_rng()
+        generated = v.generate_batch(500, rng) + v.generate_batch(500, rng)
+        self.assertEqual(sorted(generated), list(range(1000)))
+
+    def test_zipf(self):
+        v = IntegerField(min_value=1, max_value=1000,
+                         distribution=Zipf(exponent=2))
+        generated = [v.generate(random.Random(i)) for i in range(1000)]
+        self.assertTrue(all([1 <= g <= 1000 for g in generated]))
+        self.assertGreater(generated.count(1), 500)
+
+    def test_normal(self):
+        v = IntegerField(min_value=0, max_value=100,
+                         distribution=Normal(mean=50, stddev=1))
+        generated = [v.generate(random.Random(i)) for i in range(100)]
+        self.assertTrue(all([45 <= g <= 55 for g in generated]))
+        self.assertTrue(all([isinstance(g, int) for g in generated]))
+
+    def test_weights(self):
+        v = IntegerField(min_value=1, max_value=3, weights=[0, 1, 0])
+        self.assertEqual([v.generate() for _ in range(10)], [2] * 10)
+
+    def test_invalid_sampling(self):
+        with self.assertRaises(ValueError):
+            IntegerField(min_value=1, max_value=3, weights=[1, 1])
+        with self.assertRaises(ValueError):
+            IntegerField(choices=[1, 2], weights=[1, 1, 1])
+        with self.assertRaises(ValueError):
+            IntegerField(choices=[1, 2, 3], weights=[-1, 2, 0])
+        with self.assertRaises(ValueError):
+            IntegerField(choices=[1, 2, 3], weights=[0, 0, 0])
+        with self.assertRaises(ValueError):
+            IntegerField(min_value=0, max_value=10 ** 9, distribution=Zipf())
+        IntegerField(min_value=0, max_value=10 ** 9, distribution=Normal())
+        IntegerField(min_value=0, max_value=10 ** 9, choices=[1, 2],
+                     distribution=Zipf())
+
+    @skip_if_no_numpy
+    def test_generate_batch_distribution(self):
+        rng = numpy.random.default_rng()
+        v = IntegerField(max_value=100, distribution=Zipf(exponent=2))
+        generated = v.generate_batch(1000, rng)
+        self.assertTrue(all([0 <= g <= 100 for g in generated]))
+        self.assertGreater(generated.count(0), 500)
+
+        v = IntegerField(max_value=100, distribution=Exponential(rate=100))
+        generated = v.generate_batch(1000, rng)
+        self.assertEqual(generated, [0] * 1000)
+
 
 class DoubleFieldTestCase(unittest.TestCase):
 
@@ -242,6 +397,42 @@ class DoubleFieldTestCase(unittest.TestCase):
             mocked_random.choice = random.choice
             self.assertIn(v.generate(), choices)
 
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        v = DoubleField(min_value=-2.5, max_value=0)
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        self.assertEqual(len(generated), 100)
+        self.assertTrue(all([isinstance(i, float) and -2.5 <= i <= 0
+                             for i in generated]))
+
+    def test_unique(self):
+        with self.assertRaises(ValueError):
+            DoubleField(unique=True)
+        v = DoubleField(choices=[0.5, 1.5], unique=True)
+        self.assertEqual(sorted([v.generate(), v.generate()]), [0.5, 1.5])
+
+    def test_invalid_sampling(self):
+        with self.assertRaises(ValueError):
+            DoubleField(weights=[1, 2])
+        with self.assertRaises(ValueError):
+            DoubleField(distribution=Zipf())
+        DoubleField(choices=[0.5, 1.5], weights=[1, 2])
+
+    def test_distribution(self):
+        v = DoubleField(min_value=-1.0, max_value=1.0,
+                        distribution=Normal(stddev=10.0))
+        generated = [v.generate(random.Random(i)) for i in range(100)]
+        self.assertTrue(all([-1.0 <= g <= 1.0 for g in generated]))
+        self.assertIn(1.0, generated)
+
+    @skip_if_no_numpy
+    def test_generate_batch_distribution(self):
+        v = DoubleField(min_value=0.0, max_value=100.0,
+                        distribution=Exponential(rate=1.0))
+        generated = v.generate_batch(1000, numpy.random.default_rng())
+        self.assertTrue(all([0.0 <= g <= 100.0 for g in generated]))
+        self.assertAlmostEqual(sum(generated) / 1000, 1.0, delta=0.2)
+
 
 class BooleanFieldTestCase(unittest.TestCase):
 
@@ -313,6 +504,13 @@ class BooleanFieldTestCase(unittest.TestCase):
             mocked_random.choice = random.choice
             self.assertIn(v.generate(), [True, False])
 
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        v = BooleanField()
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        self.assertEqual(len(generated), 100)
+        self.assertTrue(all([isinstance(i, bool) for i in generated]))
+
 
 class StringFieldTestCase(unittest.TestCase):
 
@@ -453,6 +651,54 @@ class StringFieldTestCase(unittest.TestCase):
             mocked_random.choice = random.choice
             self.assertIn(v.generate(), choices)
 
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        charset = '!@#$%^&*()_'
+        v = StringField(min_length=5, max_length=10, charset=charset)
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        self.assertEqual(len(generated), 100)
+        self.assertTrue(all([5 <= len(g) <= 10 for g in generated]))
+        self.assertTrue(all([s in charset for g in generated for s in g]))
+
+    def test_unique(self):
+        v = StringField(min_length=1, max_length=3, charset='abc',
+                        unique=True)
+        generated = [v.generate() for _ in range(39)]
+        self.assertEqual(len(set(generated)), 39)
+        self.assertTrue(all([1 <= len(g) <= 3 and set(g) <= set('abc')
+                             for g in generated]))
+        with self.assertRaises(UniqueValuesExhaustedException):
+            v.generate()
+
+    def test_unique_large(self):
+        v = StringField(min_length=8, max_length=12, unique=True)
+        generated = [v.generate() for _ in range(10000)]
+        self.assertEqual(len(set(generated)), 10000)
+
+    def test_weighted_choices(self):
+        v = StringField(choices=['a', 'b', 'c'], weights=[8, 2, 0])
+        generated = [v.generate(random.Random(i)) for i in range(1000)]
+        self.assertEqual(set(generated), set(['a', 'b']))
+        self.assertAlmostEqual(generated.count('a') / 1000.0, 0.8,
+                               delta=0.05)
+
+    def test_invalid_sampling(self):
+        with self.assertRaises(ValueError):
+            StringField(distribution=Zipf())
+        with self.assertRaises(ValueError):
+            StringField(distribution=Normal())
+        with self.assertRaises(ValueError):
+            StringField(choices=['a', 'b'], weights=[1])
+        StringField(min_length=1, max_length=2, charset='ab',
+                    distribution=Zipf())
+
+    @skip_if_no_numpy
+    def test_generate_batch_weighted_choices(self):
+        v = StringField(choices=['a', 'b', 'c'], distribution=Zipf())
+        generated = v.generate_batch(10000, numpy.random.default_rng())
+        self.assertGreater(generated.count('a'), generated.count('b'))
+        self.assertGreater(generated.count('b'), generated.count('c'))
+
 
 class ArrayFieldTestCase(unittest.TestCase):
 
@@ -463,9 +709,9 @@ class ArrayFieldTestCase(unittest.TestCase):
         self.assertTrue(all([isinstance(i, int) for i in generated]))
 
         int_field = mock.Mock(wraps=IntegerField())
-        int_field.generate = lambda: 0
+        int_field.generate = lambda rng=None: 0
         str_field = mock.Mock(wraps=StringField())
-        str_field.generate = lambda: 'string'
+        str_field.generate = lambda rng=None: 'string'
         v = ArrayField([int_field, str_field])
         with mock.patch(FIELDS_RANDOM_MODULE) as mocked_random:
             mocked_random.randint.return_value = 2
@@ -574,6 +820,128 @@ class ArrayFieldTestCase(unittest.TestCase):
             self.assertTrue(1 <= len(generated) <= 10)
             self.assertTrue(all([isinstance(i, int) for i in generated]))
 
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        v = ArrayField([IntegerField(), BooleanField()], min_length=5,
+                       max_length=10)
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        self.assertEqual(len(generated), 100)
+        self.assertTrue(all([5 <= len(g) <= 10 for g in generated]))
+        self.assertTrue(all([isinstance(i, (int, bool))
+                             for g in generated for i in g]))
+
+
+class ObjectIdFieldTestCase(unittest.TestCase):
+
+    def test_default(self):
+        v = ObjectIdField()
+        generated = [v.generate() for _ in range(100)]
+        self.assertTrue(all([isinstance(g, ObjectId) for g in generated]))
+        self.assertEqual(len(set(generated)), 100)
+
+    def test_seed(self):
+        v = ObjectIdField()
+        self.assertEqual(v.generate(random.Random(1)),
+                         v.generate(random.Random(1)))
+
+        timestamp = 1500000000
+        with mock.patch('time.time', return_value=timestamp + 3600):
+            generated = ObjectIdField(
+                min_timestamp=timestamp, max_timestamp=timestamp + 10
+            ).generate(random.Random(1))
+        self.assertTrue(timestamp <= generated.generation_time.timestamp()
+                        <= timestamp + 10)
+
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        v = ObjectIdField()
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        self.assertTrue(all([isinstance(g, ObjectId) for g in generated]))
+        self.assertEqual(len(set(generated)), 100)
+        self.assertEqual(v.generate_batch(10, numpy.random.default_rng(1)),
+                         v.generate_batch(10, numpy.random.default_rng(1)))
+
+
+class ReferenceFieldTestCase(unittest.TestCase):
+
+    def test_in_memory(self):
+        v = ReferenceField(ParentSchema, pool_size=10)
+        generated = [v.generate() for _ in range(100)]
+        self.assertEqual(len(v.parents), 10)
+        ids = [parent['_id'] for parent in v.parents]
+        self.assertTrue(all([isinstance(i, ObjectId) for i in ids]))
+        self.assertTrue(set(generated).issubset(set(ids)))
+
+    def test_sample_collection(self):
+        collection = mock.MagicMock()
+        collection.find.return_value.limit.return_value = [
+            {'_id': i} for i in range(5)]
+        v = ReferenceField(ParentSchema, collection=collection, pool_size=5)
+        generated = [v.generate() for _ in range(100)]
+        self.assertTrue(set(generated).issubset(set(range(5))))
+        collection.find.assert_called_once_with({}, {'_id': 1})
+        self.assertFalse(collection.insert_many.called)
+
+    def test_create_parents(self):
+        collection = mock.MagicMock()
+        collection.find.return_value.limit.return_value = []
+        collection.insert_many.return_value.inserted_ids = list(range(10))
+        v = ReferenceField(ParentSchema, collection=collection, pool_size=10)
+        generated = [v.generate() for _ in range(100)]
+        self.assertTrue(set(generated).issubset(set(range(10))))
+        self.assertEqual(collection.insert_many.call_count, 1)
+        parents = collection.insert_many.call_args[0][0]
+        self.assertEqual(len(parents), 10)
+        self.assertTrue(all([0 <= p['integer'] <= 100 for p in parents]))
+
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        v = ReferenceField(ParentSchema, pool_size=10)
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        ids = set([parent['_id'] for parent in v.parents])
+        self.assertTrue(set(generated).issubset(ids))
+
+    def test_reset(self):
+        v = ReferenceField(ParentSchema, pool_size=10)
+        ids = set([v.generate() for _ in range(100)])
+        parents = v.parents
+        v.reset()
+        self.assertIsNot(v.parents, parents)
+        self.assertTrue(ids.isdisjoint(set(p['_id'] for p in v.parents)))
+
+        parents = v.parents
+        reset_references()
+        self.assertIsNot(v.parents, parents)
+
+    def test_lazy_collection(self):
+        collections = []
+
+        def collection():
+            collections.append(mock.MagicMock())
+            collections[-1].find.return_value.limit.return_value = [
+                {'_id': len(collections)}]
+            return collections[-1]
+
+        v = ReferenceField(ParentSchema, collection=collection)
+        self.assertEqual(collections, [])
+        self.assertEqual(v.generate(), 1)
+        self.assertEqual(v.generate(), 1)
+        reset_references()
+        self.assertEqual(v.generate(), 2)
+
+        other = mock.MagicMock()
+        other.find.return_value.limit.return_value = [{'_id': 'other'}]
+        v.bind(other)
+        self.assertIs(v.collection, other)
+        self.assertEqual(v.generate(), 'other')
+
+    def test_distribution(self):
+        v = ReferenceField(ParentSchema, pool_size=10, distribution=Zipf(2))
+        generated = [v.generate() for _ in range(100)]
+        self.assertGreater(generated.count(v.parents[0]['_id']), 50)
+        with self.assertRaises(ValueError):
+            ReferenceField(ParentSchema, weights=[1, 2])
+
 
 class ObjectFieldTestCase(unittest.TestCase):
 
@@ -710,3 +1078,13 @@ class ObjectFieldTestCase(unittest.TestCase):
             mocked_random.choice = random.choice
             mocked_random.randint = random.randint
             self.assertEqualSimpleSchema(v.generate())
+
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        v = ObjectField(self.nested_schema)
+        generated = v.generate_batch(100, numpy.random.default_rng())
+        self.assertEqual(len(generated), 100)
+        for value in generated:
+            self.assertEqual(set(value.keys()), set(self.nested_schema.keys()))
+            self.assertEqualSimpleSchema(value['simple'])
+            self.assertEqualComplexSchema(value['complex'])
@@ -1,5 +1,17 @@
+import unittest
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from pymongo.errors import BulkWriteError
+
+from tests import SimpleTestSchema
 from mongo_dynamic_fixture.test import MongoTestCase
+from mongo_dynamic_fixture.fields import ReferenceField
 from mongo_dynamic_fixture.fixture import Fixture
+from mongo_dynamic_fixture.registry import registry
 
 
 class FixtureTestCase(MongoTestCase):
@@ -16,3 +28,142 @@ class FixtureTestCase(MongoTestCase):
         documents = list(conn.find())
         self.assertEqual(len(documents), 1)
         self.assertEqual(documents[0], data)
+
+    def test_fixture_insert_many(self):
+        data = [{'_id': i, 'key': 'value'} for i in range(25)]
+        db_name = 'db_test'
+        coll_name = 'coll_test'
+        conn = self.mongo_client[db_name][coll_name]
+        fixture = Fixture(conn, iter(data))
+        inserted_ids = fixture.insert_many(batch_size=10)
+
+        self.assertEqual(inserted_ids, list(range(25)))
+        documents = list(conn.find().sort('_id'))
+        self.assertEqual(documents, data)
+
+    def test_fixture_write_options(self):
+        data = [{'_id': i, 'key': 'value'} for i in range(25)]
+        conn = self.mongo_client['db_test']['coll_test']
+        fixture = Fixture(conn, iter(data), write_concern={'w': 1, 'j': False},
+                          bypass_document_validation=True)
+        inserted_ids = fixture.insert_many(batch_size=10, ordered=False)
+        self.assertEqual(sorted(inserted_ids), list(range(25)))
+        self.assertEqual(conn.count(), 25)
+
+    def test_fixture_retries_duplicates(self):
+        conn = self.mongo_client['db_test']['coll_test']
+        conn.insert_one({'_id': 3})
+        data = [{'_id': i} for i in range(10)]
+        inserted_ids = Fixture(conn, data).insert_many(ordered=True,
+                                                       retries=1)
+
+        self.assertEqual(inserted_ids, [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(conn.count(), 10)
+
+
+class FlakyCollection(object):
+
+    def __init__(self, failures):
+        self.database = mock.Mock()
+        self.name = 'coll_test'
+        self.failures = failures
+        self.documents = []
+        self.calls = []
+
+    def insert_many(self, documents, ordered=True):
+        self.calls.append([d['_id'] for d in documents])
+        errors = self.failures.pop(0) if self.failures else {}
+        write_errors = []
+        for index, document in enumerate(documents):
+            if document['_id'] in errors:
+                write_errors.append({'index': index,
+                                     'code': errors[document['_id']]})
+                if ordered:
+                    break
+            else:
+                self.documents.append(document)
+        if write_errors:
+            raise BulkWriteError({'writeErrors': write_errors})
+
+        return mock.Mock(inserted_ids=[d['_id'] for d in documents])
+
+
+class FixtureRetriesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = [{'_id': i} for i in range(10)]
+
+    def test_no_retries(self):
+        conn = FlakyCollection([{3: 1}])
+        with self.assertRaises(BulkWriteError):
+            Fixture(conn, self.data).insert_many()
+
+    def test_retries_unordered(self):
+        conn = FlakyCollection([{3: 1, 7: 1, 8: 11000}, {7: 1}])
+        inserted_ids = Fixture(conn, self.data).insert_many(ordered=False,
+                                                            retries=2)
+
+        self.assertEqual(conn.calls[1:], [[3, 7], [7]])
+        self.assertEqual(inserted_ids, [0, 1, 2, 3, 4, 5, 6, 7, 9])
+
+    def test_retries_ordered(self):
+        conn = FlakyCollection([{3: 1}, {5: 11000}])
+        inserted_ids = Fixture(conn, self.data).insert_many(retries=2)
+
+        self.assertEqual(conn.calls[1:], [list(range(3, 10)), [6, 7, 8, 9]])
+        self.assertEqual(inserted_ids, [0, 1, 2, 3, 4, 6, 7, 8, 9])
+
+    def test_write_concern_errors(self):
+        details = {'writeErrors': [],
+                   'writeConcernErrors': [{'code': 64, 'errmsg': 'timeout'}]}
+        for ordered in [True, False]:
+            conn = mock.Mock()
+            conn.insert_many.side_effect = BulkWriteError(details)
+            with self.assertRaises(BulkWriteError):
+                Fixture(conn, self.data).insert_many(ordered=ordered,
+                                                     retries=2)
+            self.assertEqual(conn.insert_many.call_count, 1)
+
+        details = {'writeErrors': [{'index': 3, 'code': 1}],
+                   'writeConcernErrors': [{'code': 64, 'errmsg': 'timeout'}]}
+        conn = mock.Mock()
+        conn.insert_many.side_effect = BulkWriteError(details)
+        with self.assertRaises(BulkWriteError):
+            Fixture(conn, self.data).insert_many(ordered=False, retries=2)
+
+    def test_retries_exhausted(self):
+        conn = FlakyCollection([{3: 1}, {3: 1}])
+        with self.assertRaises(BulkWriteError):
+            Fixture(conn, self.data).insert_many(ordered=False, retries=1)
+
+
+class TrackedFixtureTestCase(MongoTestCase):
+
+    track_writes = True
+
+    def test_fixture(self):
+        conn = self.mongo_client['db_test']['coll_test']
+        Fixture(conn, {'key': 'value'}).insert()
+        self.mongo_client['db_test']['other_coll'].insert_one({'key': 1})
+        self.assertIn((conn.database.name, 'coll_test'), registry)
+
+        self.assertEqual(self.purge_written(),
+                         set([(conn.database.name, 'coll_test')]))
+        self.assertEqual(conn.count(), 0)
+        self.assertEqual(
+            self.mongo_client['db_test']['other_coll'].count(), 1)
+        self.mongo_client['db_test'].drop_collection('other_coll')
+
+
+class ReferenceFixtureTestCase(MongoTestCase):
+
+    def test_reset_on_tear_down(self):
+        parents = self.mongo_client['db_test']['parents']
+        v = ReferenceField(SimpleTestSchema, collection=lambda: parents,
+                           pool_size=5)
+        v.generate()
+        self.assertEqual(parents.count(), 5)
+
+        self.tearDown()
+        self.assertEqual(parents.count(), 0)
+        self.assertIn(v.generate(), [p['_id'] for p in parents.find()])
@@ -0,0 +1,68 @@
+import unittest
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from mongo_dynamic_fixture.indexes import ASCENDING
+from mongo_dynamic_fixture.indexes import DESCENDING
+from mongo_dynamic_fixture.indexes import Index
+from mongo_dynamic_fixture.indexes import create_indexes
+
+
+class IndexTestCase(unittest.TestCase):
+
+    def test_single(self):
+        index = Index('name')
+        self.assertEqual(index.keys, [('name', ASCENDING)])
+        self.assertEqual(index.name, 'name_1')
+        self.assertEqual(index.options, {'name': 'name_1'})
+
+    def test_compound_unique(self):
+        index = Index([('name', ASCENDING), ('stats.visits', DESCENDING)],
+                      unique=True)
+        self.assertEqual(index.name, 'name_1_stats.visits_-1')
+        self.assertEqual(index.options,
+                         {'name': 'name_1_stats.visits_-1', 'unique': True})
+
+    def test_ttl(self):
+        index = Index('created_at', expire_after_seconds=3600,
+                      name='ttl', sparse=True)
+        self.assertEqual(index.options, {'name': 'ttl',
+                                         'expireAfterSeconds': 3600,
+                                         'sparse': True})
+
+    def test_document(self):
+        index = Index([('b', 1), ('a', -1)], unique=True)
+        document = index.document('db_test.coll_test')
+        self.assertEqual(list(document['key'].items()), [('b', 1), ('a', -1)])
+        self.assertEqual(document['unique'], True)
+        self.assertEqual(document['ns'], 'db_test.coll_test')
+        self.assertEqual(document['v'], 2)
+
+
+class CreateIndexesTestCase(unittest.TestCase):
+
+    indexes = [Index('name', unique=True), Index('created_at')]
+
+    def test_create_indexes(self):
+        conn = mock.Mock()
+        create_indexes(conn, self.indexes)
+        self.assertEqual(conn.create_indexes.call_count, 1)
+        models = conn.create_indexes.call_args[0][0]
+        self.assertEqual([m.document['name'] for m in models],
+                         ['name_1', 'created_at_1'])
+        self.assertTrue(models[0].document['unique'])
+
+    def test_create_index(self):
+        conn = mock.Mock(spec=['create_index'])
+        create_indexes(conn, self.indexes)
+        conn.create_index.assert_has_calls([
+            mock.call([('name', 1)], name='name_1', unique=True),
+            mock.call([('created_at', 1)], name='created_at_1')])
+
+    def test_no_indexes(self):
+        conn = mock.Mock()
+        self.assertEqual(create_indexes(conn, []), [])
+        self.assertFalse(conn.create_indexes.called)
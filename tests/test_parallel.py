@@ -0,0 +1,135 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tests import SimpleTestSchema
+from mongo_dynamic_fixture import N
+from mongo_dynamic_fixture.schema import BaseSchema
+from mongo_dynamic_fixture.fields import ArrayField
+from mongo_dynamic_fixture.fields import IntegerField
+from mongo_dynamic_fixture.fields import StringField
+from mongo_dynamic_fixture.fields import ReferenceField
+from mongo_dynamic_fixture.fields import reset_references
+from mongo_dynamic_fixture.encoding import RawBSONDocument
+from mongo_dynamic_fixture.parallel import generate_chunk
+from mongo_dynamic_fixture.parallel import generate_parallel
+
+
+class UniqueTestSchema(BaseSchema):
+
+    schema = {
+        'integer': IntegerField(max_value=999, unique=True),
+        'nest': {
+            'strings': ArrayField(StringField(unique=True), max_length=5)
+        }
+    }
+
+
+class LargeUniqueTestSchema(BaseSchema):
+
+    schema = {
+        'integer': IntegerField(max_value=10 ** 6, unique=True)
+    }
+
+
+class ReferenceTestSchema(BaseSchema):
+
+    schema = {
+        'parent': ReferenceField(SimpleTestSchema, pool_size=10),
+        'nest': {
+            'parents': ArrayField(ReferenceField(SimpleTestSchema))
+        }
+    }
+
+
+class GenerateParallelTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        reset_references()
+
+    def test_generate_chunk(self):
+        self.assertEqual(generate_chunk(SimpleTestSchema, 10, 42),
+                         generate_chunk(SimpleTestSchema, 10, 42))
+        self.assertNotEqual(generate_chunk(SimpleTestSchema, 10, 42),
+                            generate_chunk(SimpleTestSchema, 10, 43))
+
+    def test_generate_parallel(self):
+        chunks = list(generate_parallel(SimpleTestSchema, 25, workers=2,
+                                        chunk_size=10, nest_3__double=1.5))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        self.assertTrue(all([data['nest_3']['double'] == 1.5
+                             for chunk in chunks for data in chunk]))
+
+    def test_generate_parallel_reproducible(self):
+        generated = [
+            list(generate_parallel(SimpleTestSchema, 25, workers=workers,
+                                   seed=42, chunk_size=5))
+            for workers in [1, 2, 3]]
+        self.assertEqual(generated[0], generated[1])
+        self.assertEqual(generated[0], generated[2])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_generate_parallel_batch(self):
+        generated = [
+            list(generate_parallel(SimpleTestSchema, 25, workers=workers,
+                                   seed=42, chunk_size=5, batch=True))
+            for workers in [1, 2]]
+        self.assertEqual([len(chunk) for chunk in generated[0]], [5] * 5)
+        self.assertEqual(generated[0], generated[1])
+
+    @unittest.skipIf(RawBSONDocument is None, 'pymongo>=3.2 is not installed')
+    def test_generate_parallel_raw(self):
+        chunks = list(generate_parallel(SimpleTestSchema, 10, workers=2,
+                                        chunk_size=5, raw=True))
+        self.assertTrue(all([isinstance(data, RawBSONDocument)
+                             for chunk in chunks for data in chunk]))
+
+    def test_generate_parallel_unique(self):
+        for batch in [False, True] if numpy is not None else [False]:
+            for sequence in UniqueTestSchema().sequences():
+                sequence.seek(0)
+            generated = [
+                data for chunk in generate_parallel(
+                    UniqueTestSchema, 1000, workers=2, chunk_size=100,
+                    batch=batch)
+                for data in chunk]
+            self.assertEqual(sorted([data['integer'] for data in generated]),
+                             list(range(1000)))
+            strings = [string for data in generated
+                       for string in data['nest']['strings']]
+            self.assertEqual(len(set(strings)), len(strings))
+
+    def test_generate_parallel_unique_consecutive(self):
+        def parallel(seed):
+            return [data['integer'] for chunk in generate_parallel(
+                LargeUniqueTestSchema, 100, workers=2, seed=seed,
+                chunk_size=30) for data in chunk]
+
+        serial = [N(LargeUniqueTestSchema)['integer'] for _ in range(100)]
+        first = parallel(42)
+        second = parallel(43)
+        generated = serial + first + second + [
+            N(LargeUniqueTestSchema)['integer'] for _ in range(100)]
+        self.assertEqual(len(first), 100)
+        self.assertEqual(len(second), 100)
+        self.assertEqual(len(set(generated)), 400)
+
+    def test_generate_parallel_references(self):
+        generated = generate_chunk(ReferenceTestSchema, 10, 42,
+                                   pools=[[1, 2], [3]])
+        self.assertTrue(all([data['parent'] in (1, 2) for data in generated]))
+        self.assertTrue(all([data['nest']['parents'] == [3] * len(
+            data['nest']['parents']) for data in generated]))
+
+        reset_references()
+        references = ReferenceTestSchema().references()
+        self.assertEqual(len(references), 2)
+        generated = [data for chunk in generate_parallel(
+            ReferenceTestSchema, 50, workers=2, seed=42, chunk_size=10)
+            for data in chunk]
+        self.assertTrue(set([data['parent'] for data in generated])
+                        .issubset(set(references[0].choices)))
+        self.assertEqual(len(references[0].parents), 10)
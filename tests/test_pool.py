@@ -0,0 +1,45 @@
+import time
+import unittest
+
+from tests import SimpleTestSchema
+from mongo_dynamic_fixture.pool import FixturePool
+
+
+class FixturePoolTestCase(unittest.TestCase):
+
+    def test_prefill(self):
+        pool = FixturePool(SimpleTestSchema, size=10, prefill=True,
+                           start=False)
+        self.assertEqual(len(pool), 10)
+
+        generated = pool.N(nest_3__double=999.999,
+                           extra={'nest-1__integer': 10000})
+        self.assertEqual(len(pool), 9)
+        self.assertEqual(set(generated.keys()),
+                         set(SimpleTestSchema.schema.keys()))
+        self.assertEqual(generated['nest-1']['integer'], 10000)
+        self.assertEqual(generated['nest_3']['double'], 999.999)
+
+    def test_empty(self):
+        pool = FixturePool(SimpleTestSchema, size=10, start=False)
+        self.assertEqual(len(pool), 0)
+        generated = pool.N(_id='123')
+        self.assertEqual(generated['_id'], '123')
+
+    def test_invalid_size(self):
+        for size in [0, -1]:
+            with self.assertRaises(ValueError):
+                FixturePool(SimpleTestSchema, size=size)
+
+    def test_refill(self):
+        with FixturePool(SimpleTestSchema, size=10) as pool:
+            deadline = time.time() + 5
+            while len(pool) < 10 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(pool), 10)
+
+            generated = [pool.N(_id=i) for i in range(20)]
+            self.assertEqual([g['_id'] for g in generated], list(range(20)))
+            self.assertEqual(len(set([id(g) for g in generated])), 20)
+
+        self.assertIsNone(pool._thread)
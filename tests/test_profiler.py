@@ -0,0 +1,76 @@
+import unittest
+
+from mongo_dynamic_fixture import N
+from mongo_dynamic_fixture.schema import BaseSchema
+from mongo_dynamic_fixture.fields import ArrayField
+from mongo_dynamic_fixture.fields import IntegerField
+from mongo_dynamic_fixture.fields import ObjectField
+from mongo_dynamic_fixture.fields import StringField
+from mongo_dynamic_fixture.profiler import Profiler
+
+
+class ProfiledTestSchema(BaseSchema):
+
+    schema = {
+        'name': StringField(),
+        'aliases': ArrayField(StringField(), min_length=2, max_length=2),
+        'stats': {
+            'last_day_visits': IntegerField(not_present_prob=0.5,
+                                            required=False)
+        },
+        'owner': ObjectField({'name': StringField()}, null=True,
+                             null_prob=0.5)
+    }
+
+
+class ProfilerTestCase(unittest.TestCase):
+
+    def test_report(self):
+        profiler = Profiler()
+        schema = ProfiledTestSchema(profiler=profiler)
+        for _ in range(10):
+            generated = schema.generate()
+            self.assertEqual(len(generated['aliases']), 2)
+
+        report = profiler.report()
+        self.assertEqual(set(report),
+                         set(['name', 'aliases', 'aliases[]',
+                              'stats.last_day_visits', 'owner',
+                              'owner.name']))
+        self.assertEqual(report['name']['calls'], 10)
+        self.assertEqual(report['aliases[]']['calls'], 20)
+        self.assertEqual(report['stats.last_day_visits']['calls'], 10)
+        self.assertLessEqual(report['owner.name']['calls'], 10)
+        self.assertGreaterEqual(report['aliases']['seconds'],
+                                report['aliases[]']['seconds'])
+
+        profiler.reset()
+        self.assertEqual(profiler.report()['name']['calls'], 0)
+
+    def test_disabled(self):
+        self.assertIs(ProfiledTestSchema()._plan,
+                      ProfiledTestSchema()._plan)
+        self.assertIsNot(ProfiledTestSchema(profiler=Profiler())._plan,
+                         ProfiledTestSchema()._plan)
+
+    def test_N(self):
+        profiler = Profiler()
+        generated = N(ProfiledTestSchema, profiler=profiler, name='abc')
+        self.assertEqual(generated['name'], 'abc')
+        self.assertEqual(profiler.report()['name']['calls'], 1)
+
+    def test_table(self):
+        profiler = Profiler()
+        schema = ProfiledTestSchema(profiler=profiler)
+        for _ in range(10):
+            schema.generate()
+
+        lines = profiler.table().splitlines()
+        self.assertEqual(lines[0].split()[:3], ['path', 'calls', 'seconds'])
+        self.assertEqual(len(lines), 7)
+        seconds = [float(line.split()[2]) for line in lines[1:]]
+        self.assertEqual(seconds, sorted(seconds, reverse=True))
+
+        lines = profiler.table(sort_by='calls', limit=1).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1].split()[:2], ['aliases[]', '20'])
@@ -0,0 +1,69 @@
+import unittest
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from mongo_dynamic_fixture.fixture import Fixture
+from mongo_dynamic_fixture.registry import WriteRegistry
+from mongo_dynamic_fixture.registry import purge_collections
+from mongo_dynamic_fixture.registry import registry
+
+
+def collection(db_name, coll_name):
+    conn = mock.MagicMock()
+    conn.database.name = db_name
+    conn.name = coll_name
+    return conn
+
+
+class WriteRegistryTestCase(unittest.TestCase):
+
+    def test_record(self):
+        written = WriteRegistry()
+        written.record(collection('db_test', 'coll_test'))
+        written.record(collection('db_test', 'coll_test'))
+        written.record(collection('db_test', 'other_coll'))
+        self.assertEqual(len(written), 2)
+        self.assertIn(('db_test', 'coll_test'), written)
+
+        self.assertEqual(written.pop(),
+                         set([('db_test', 'coll_test'),
+                              ('db_test', 'other_coll')]))
+        self.assertEqual(len(written), 0)
+
+    def test_fixture(self):
+        registry.clear()
+        Fixture(collection('db_test', 'coll_test'), {}).insert()
+        Fixture(collection('db_test', 'other_coll'), []).insert_many()
+        self.assertEqual(registry.pop(),
+                         set([('db_test', 'coll_test'),
+                              ('db_test', 'other_coll')]))
+
+
+class PurgeCollectionsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.collections = set([('db_test', 'coll_%d' % i) for i in range(8)])
+
+    def test_drop(self):
+        purged = purge_collections(self.client, self.collections)
+        self.assertEqual(purged, self.collections)
+        db = self.client['db_test']
+        self.assertEqual(
+            sorted(c[0][0] for c in db.drop_collection.call_args_list),
+            ['coll_%d' % i for i in range(8)])
+
+    def test_drop_parallel(self):
+        purged = purge_collections(self.client, self.collections, workers=4)
+        self.assertEqual(purged, self.collections)
+        db = self.client['db_test']
+        self.assertEqual(db.drop_collection.call_count, 8)
+
+    def test_delete(self):
+        purge_collections(self.client, self.collections, drop=False)
+        db = self.client['db_test']
+        self.assertFalse(db.drop_collection.called)
+        self.assertEqual(db['coll_0'].delete_many.call_count, 8)
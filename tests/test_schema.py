@@ -1,7 +1,22 @@
+import random
 import string
 import unittest
 
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from tests import SimpleTestSchema
+from mongo_dynamic_fixture import N
+from mongo_dynamic_fixture.schema import BaseSchema
+from mongo_dynamic_fixture.fields import IntegerField
+from mongo_dynamic_fixture.encoding import RawBSONDocument
 
 
 class SchemaTestCase(unittest.TestCase):
@@ -49,3 +64,156 @@ class SchemaTestCase(unittest.TestCase):
             set(SimpleTestSchema.schema['nest-1']['nest-2'].keys()))
         self.assertEqual(generated['nest-1']['nest-2']['string'], 'abcdef')
         self.assertEqual(generated['nest_3']['double'], 999.999)
+
+    def test_plan_compiled_once_per_class(self):
+
+        class OtherTestSchema(SimpleTestSchema):
+
+            schema = {'integer': IntegerField()}
+
+        self.assertIs(SimpleTestSchema()._plan, SimpleTestSchema()._plan)
+        self.assertIsNot(OtherTestSchema()._plan, SimpleTestSchema()._plan)
+        self.assertEqual(set(OtherTestSchema().generate().keys()),
+                         set(['integer']))
+
+    def test_not_present(self):
+
+        class NotPresentTestSchema(BaseSchema):
+
+            schema = {
+                'integer': IntegerField(),
+                'nest': {
+                    'integer': IntegerField(required=False,
+                                            not_present_prob=1)
+                }
+            }
+
+        generated = NotPresentTestSchema().generate()
+        self.assertEqual(set(generated.keys()), set(['integer', 'nest']))
+        self.assertEqual(generated['nest'], {})
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_generate_batch(self):
+        v = SimpleTestSchema()
+        generated = v.generate_batch(100, numpy.random.default_rng(),
+                                     nest_3__double=999.999,
+                                     extra={'nest-1__integer': 10000})
+        self.assertEqual(len(generated), 100)
+        for g in generated:
+            self.assertEqual(set(g.keys()),
+                             set(SimpleTestSchema.schema.keys()))
+            self.assertTrue(1 <= len(g['array']) <= 10)
+            self.assertTrue(all([isinstance(i, int) for i in g['array']]))
+            self.assertEqual(g['nest-1']['integer'], 10000)
+            self.assertTrue(1 <= len(g['nest-1']['nest-2']['string']) <= 10)
+            self.assertEqual(g['nest_3']['double'], 999.999)
+
+    def test_iter_generate(self):
+        v = SimpleTestSchema()
+        generated = v.iter_generate(5, nest_3__double=999.999)
+        self.assertFalse(isinstance(generated, list))
+        generated = list(generated)
+        self.assertEqual(len(generated), 5)
+        self.assertTrue(all([g['nest_3']['double'] == 999.999
+                             for g in generated]))
+
+        generated = list(v.iter_generate(5, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in generated], [2, 2, 1])
+
+        generated = v.iter_generate()
+        self.assertEqual(len([next(generated) for _ in range(100)]), 100)
+
+    def test_generate_with_rng(self):
+        v = SimpleTestSchema()
+        generated = [v.generate(rng=random.Random(42)) for _ in range(2)]
+        self.assertEqual(generated[0], generated[1])
+        self.assertNotEqual(generated[0], v.generate(rng=random.Random(43)))
+
+        generated = [list(v.iter_generate(5, rng=random.Random(42)))
+                     for _ in range(2)]
+        self.assertEqual(generated[0], generated[1])
+
+    def test_override_reserved_names(self):
+        class ReservedTestSchema(BaseSchema):
+
+            schema = {
+                'rng': IntegerField(),
+                'raw': IntegerField()
+            }
+
+        v = ReservedTestSchema()
+        overrides = {'rng': 5, 'raw': 6}
+        expected = {'rng': 5, 'raw': 6}
+        self.assertEqual(v.generate(extra=overrides), expected)
+        self.assertEqual(N(ReservedTestSchema, extra=overrides), expected)
+        self.assertEqual(list(v.iter_generate(2, extra=overrides)),
+                         [expected] * 2)
+        self.assertEqual(v.template(['raw'], extra=overrides).generate(),
+                         expected)
+        self.assertEqual(overrides, {'rng': 5, 'raw': 6})
+
+    def test_generate_with_reseeded_rng(self):
+        v = SimpleTestSchema()
+        rng = random.Random(1)
+        generated = [v.generate(rng=rng) for _ in range(3)]
+        rng.seed(1)
+        self.assertEqual([v.generate(rng=rng) for _ in range(3)], generated)
+
+        random.seed(5)
+        generated = [v.generate() for _ in range(3)]
+        random.seed(5)
+        self.assertEqual([v.generate() for _ in range(3)], generated)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_generate_batch_with_rng(self):
+        v = SimpleTestSchema()
+        generated = [v.generate_batch(5, numpy.random.default_rng(42))
+                     for _ in range(2)]
+        self.assertEqual(generated[0], generated[1])
+
+    def test_overrider_cached(self):
+        v = SimpleTestSchema()
+        overrider = v._build_overrider({'nest-1__integer': 1, '_id': 2})
+        self.assertEqual(sorted(overrider),
+                         [([], '_id', 2), (['nest-1'], 'integer', 1)])
+        self.assertIs(
+            v._overriders_cache.get(('_id', 'nest-1__integer')),
+            SimpleTestSchema()._overriders_cache.get(
+                ('_id', 'nest-1__integer')))
+
+        for i in range(3):
+            generated = v.generate(**{'nest-1__integer': i, '_id': i})
+            self.assertEqual(generated['_id'], i)
+            self.assertEqual(generated['nest-1']['integer'], i)
+
+    def test_no_overrides(self):
+        v = SimpleTestSchema()
+        with mock.patch.object(SimpleTestSchema, '_build_overrider') as build:
+            v.generate()
+            v.generate(rng=random.Random(42), extra={})
+            list(v.iter_generate(3))
+            v.override({'key': 1})
+        self.assertFalse(build.called)
+
+    def test_override_mapping(self):
+        v = SimpleTestSchema()
+        generated = v.generate(nest_3={'other': 1}, new__nested__key=2)
+        self.assertEqual(set(generated['nest_3'].keys()),
+                         set(['double', 'other']))
+        self.assertEqual(generated['nest_3']['other'], 1)
+        self.assertEqual(generated['new'], {'nested': {'key': 2}})
+
+    @unittest.skipIf(RawBSONDocument is None, 'pymongo>=3.2 is not installed')
+    def test_generate_raw(self):
+        v = SimpleTestSchema()
+        generated = v.generate_raw(rng=random.Random(42), _id='123')
+        self.assertTrue(isinstance(generated, RawBSONDocument))
+        self.assertEqual(generated['_id'], '123')
+        expected = v.generate(rng=random.Random(42), _id='123')
+        self.assertEqual(generated['nest-1']['nest-2']['string'],
+                         expected['nest-1']['nest-2']['string'])
+
+        generated = list(v.iter_generate(3, raw=True))
+        self.assertTrue(all([isinstance(g, RawBSONDocument)
+                             for g in generated]))
+        self.assertEqual(len(set([g['_id'] for g in generated])), 3)
@@ -0,0 +1,98 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from mongo_dynamic_fixture.shared import NamespacedClient
+from mongo_dynamic_fixture.shared import SharedInstance
+from mongo_dynamic_fixture.shared import worker_namespace
+
+
+class SharedInstanceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.lock_path = os.path.join(self.directory, 'test.lock')
+        self.box = mock.MagicMock(port=27999, db_path='/tmp/db')
+        self.box.process.pid = os.getpid()
+        self.box_factory = mock.MagicMock(return_value=self.box)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_state(self):
+        with open(self.lock_path) as f:
+            content = f.read()
+        return json.loads(content)
+
+    def write_state(self, state):
+        with open(self.lock_path, 'w') as f:
+            f.write(json.dumps(state))
+
+    def test_start(self):
+        shared = SharedInstance(self.box_factory, lock_path=self.lock_path,
+                                namespace='w1__')
+        self.assertTrue(shared.owner)
+        self.assertEqual(shared.port, 27999)
+        self.assertEqual(shared.namespace, 'w1__')
+        self.box.start.assert_called_once_with()
+        self.assertEqual(self.read_state(),
+                         {'port': 27999, 'pid': os.getpid(),
+                          'db_path': '/tmp/db', 'clients': [os.getpid()]})
+
+        shared.detach()
+        self.box.stop.assert_called_once_with()
+        self.assertEqual(self.read_state(), {})
+
+    def test_attach(self):
+        self.write_state({'port': 28000, 'pid': os.getpid(),
+                          'db_path': '/tmp/db', 'clients': [os.getppid()]})
+        shared = SharedInstance(self.box_factory, lock_path=self.lock_path)
+        self.assertFalse(shared.owner)
+        self.assertEqual(shared.port, 28000)
+        self.assertFalse(self.box_factory.called)
+        self.assertEqual(self.read_state()['clients'],
+                         [os.getppid(), os.getpid()])
+
+        shared.detach()
+        self.assertEqual(self.read_state()['clients'], [os.getppid()])
+
+    def test_attach_dead_instance(self):
+        self.write_state({'port': 28000, 'pid': 2 ** 22 + 1,
+                          'db_path': '/tmp/db', 'clients': [2 ** 22 + 1]})
+        shared = SharedInstance(self.box_factory, lock_path=self.lock_path)
+        self.assertTrue(shared.owner)
+        self.assertEqual(shared.port, 27999)
+        self.assertEqual(self.read_state()['clients'], [os.getpid()])
+
+    def test_worker_namespace(self):
+        self.assertEqual(worker_namespace(123), 'w123__')
+        self.assertNotEqual(worker_namespace(123), worker_namespace(124))
+
+
+class NamespacedClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.mongo_client = mock.MagicMock()
+        self.mongo_client.list_database_names.return_value = [
+            'w1__db_test', 'w2__db_test', 'db_test', 'admin']
+        self.client = NamespacedClient(self.mongo_client, 'w1__')
+
+    def test_getitem(self):
+        self.client['db_test']
+        self.mongo_client.__getitem__.assert_called_once_with('w1__db_test')
+
+    def test_database_names(self):
+        self.assertEqual(self.client.database_names(), ['db_test'])
+        self.assertEqual(self.client.list_database_names(), ['db_test'])
+
+    def test_drop_database(self):
+        self.client.drop_database('db_test')
+        self.mongo_client.drop_database.assert_called_once_with(
+            'w1__db_test')
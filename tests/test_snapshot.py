@@ -0,0 +1,55 @@
+from tests import SimpleTestSchema
+from mongo_dynamic_fixture import G_many
+from mongo_dynamic_fixture.test import MongoTestCase
+from mongo_dynamic_fixture.snapshot import Snapshot
+
+
+class SnapshotTestCase(MongoTestCase):
+
+    def setUp(self):
+        super(SnapshotTestCase, self).setUp()
+        self.conn = self.mongo_client['db_test']['coll_test']
+
+    def test_snapshot(self):
+        G_many(self.conn, SimpleTestSchema, count=10)
+        self.conn.create_index('nest-1.integer')
+        documents = list(self.conn.find())
+        snapshot = Snapshot.take(self.mongo_client)
+        self.assertEqual(len(snapshot), 1)
+        self.assertEqual(snapshot.changed(self.mongo_client), set())
+
+        self.conn.delete_many({})
+        self.mongo_client['db_test']['other_coll'].insert_one({'key': 1})
+        self.assertEqual(snapshot.changed(self.mongo_client),
+                         set([('db_test', 'coll_test'),
+                              ('db_test', 'other_coll')]))
+
+        snapshot.restore(self.mongo_client)
+        self.assertEqual(list(self.conn.find()), documents)
+        self.assertIn('nest-1.integer_1', self.conn.index_information())
+        self.assertNotIn('other_coll',
+                         self.mongo_client['db_test'].collection_names())
+
+
+class BaselineTestCase(MongoTestCase):
+
+    @classmethod
+    def setUpBaseline(cls, mongo_client):
+        G_many(mongo_client['db_test']['coll_test'], SimpleTestSchema,
+               count=10)
+
+    def setUp(self):
+        super(BaselineTestCase, self).setUp()
+        self.conn = self.mongo_client['db_test']['coll_test']
+
+    def test_baseline(self):
+        self.assertEqual(self.conn.count(), 10)
+
+    def test_restore_baseline(self):
+        G_many(self.conn, SimpleTestSchema, count=5)
+        self.assertEqual(self.conn.count(), 15)
+
+        restored = self.restore_baseline()
+        self.assertEqual(restored, set([('db_test', 'coll_test')]))
+        self.assertEqual(self.conn.count(), 10)
+        self.assertEqual(self.restore_baseline(), set())
@@ -0,0 +1,129 @@
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tests import SimpleTestSchema
+from mongo_dynamic_fixture.schema import BaseSchema
+from mongo_dynamic_fixture.fields import IntegerField
+from mongo_dynamic_fixture.fields import ObjectField
+from mongo_dynamic_fixture.fields import StringField
+from mongo_dynamic_fixture.template import Template
+from mongo_dynamic_fixture.template import varying_tree
+from mongo_dynamic_fixture.exceptions import InvalidPathException
+
+
+skip_if_no_numpy = unittest.skipIf(numpy is None, 'numpy is not installed')
+
+
+class TemplateTestSchema(BaseSchema):
+
+    schema = {
+        'id': IntegerField(unique=True, max_value=10 ** 6),
+        'name': StringField(),
+        'maybe': IntegerField(required=False, not_present_prob=0.5),
+        'object': ObjectField({
+            'integer': IntegerField(),
+            'string': StringField()
+        }, null=True, null_prob=0.5),
+        'nest': {
+            'integer': IntegerField(),
+            'string': StringField()
+        }
+    }
+
+
+class TemplateTestCase(unittest.TestCase):
+
+    def test_varying_tree(self):
+        self.assertEqual(varying_tree(['a.b', 'a.c.d', 'e']),
+                         {'a': {'b': None, 'c': {'d': None}}, 'e': None})
+        self.assertEqual(varying_tree(['a.b', 'a']), {'a': None})
+        self.assertEqual(varying_tree(['a', 'a.b']), {'a': None})
+
+    def test_generate(self):
+        template = Template(SimpleTestSchema(), ['nest-1.integer', 'array'],
+                            rng=random.Random(42))
+        document = template.document
+        generated = [template.generate(random.Random(i)) for i in range(50)]
+        integers = set(g['nest-1']['integer'] for g in generated)
+        self.assertTrue(len(integers) > 1)
+        for g in generated:
+            self.assertIsNot(g, document)
+            self.assertIsNot(g['nest-1'], document['nest-1'])
+            self.assertIs(g['nest-1']['nest-2'], document['nest-1']['nest-2'])
+            self.assertIs(g['nest_3'], document['nest_3'])
+            self.assertTrue(0 <= g['nest-1']['integer'] <= 100)
+        self.assertEqual(template.document, document)
+
+    def test_reproducible(self):
+        schema = SimpleTestSchema()
+        self.assertEqual(
+            list(schema.iter_generate(5, rng=random.Random(42),
+                                      varying=['nest_3.double'])),
+            list(schema.iter_generate(5, rng=random.Random(42),
+                                      varying=['nest_3.double'])))
+
+    def test_unique(self):
+        class UniqueTestSchema(BaseSchema):
+
+            schema = {
+                'id': IntegerField(unique=True, min_value=0, max_value=999),
+                'name': StringField()
+            }
+
+        template = Template(UniqueTestSchema(), ['id'])
+        ids = [template.generate()['id'] for _ in range(999)]
+        self.assertEqual(len(set(ids + [template.document['id']])), 1000)
+
+    def test_not_present_and_null(self):
+        template = TemplateTestSchema().template(['maybe', 'object.integer'])
+        generated = [template.generate(random.Random(i)) for i in range(100)]
+        self.assertIn(True, ['maybe' in g for g in generated])
+        self.assertIn(False, ['maybe' in g for g in generated])
+        for g in generated:
+            self.assertEqual(g['object'] is None,
+                             template.document['object'] is None)
+
+    def test_whole_subdocument(self):
+        template = TemplateTestSchema().template(['nest'])
+        generated = template.generate()
+        self.assertIsNot(generated['nest'], template.document['nest'])
+        self.assertEqual(set(generated['nest']), set(['integer', 'string']))
+
+    def test_overrides(self):
+        template = SimpleTestSchema().template(
+            ['nest-1.integer'], extra={'nest-1__integer': 1000,
+                                       'nest_3__double': 2})
+        self.assertEqual(template.document['nest-1']['integer'], 1000)
+        for _ in range(10):
+            generated = template.generate()
+            self.assertEqual(generated['nest-1']['integer'], 1000)
+            self.assertEqual(generated['nest_3']['double'], 2)
+
+    def test_invalid_path(self):
+        schema = SimpleTestSchema()
+        with self.assertRaises(InvalidPathException):
+            schema.template(['missing'])
+        with self.assertRaises(InvalidPathException):
+            schema.template(['nest-1.missing'])
+        with self.assertRaises(InvalidPathException):
+            schema.template(['array.integer'])
+
+    def test_iter_generate(self):
+        chunks = list(SimpleTestSchema().iter_generate(
+            10, chunk_size=4, varying=['array']))
+        self.assertEqual([len(c) for c in chunks], [4, 4, 2])
+
+    @skip_if_no_numpy
+    def test_generate_batch(self):
+        schema = TemplateTestSchema()
+        generated = schema.generate_batch(
+            100, numpy.random.default_rng(42), varying=['id', 'nest.integer'])
+        self.assertEqual(len(set(g['id'] for g in generated)), 100)
+        self.assertEqual(len(set(g['name'] for g in generated)), 1)
+        self.assertEqual(len(set(id(g['nest']) for g in generated)), 100)
+        self.assertEqual(len(set(id(g['object']) for g in generated)), 1)
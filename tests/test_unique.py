@@ -0,0 +1,40 @@
+import unittest
+
+from mongo_dynamic_fixture.unique import UniqueSequence
+from mongo_dynamic_fixture.exceptions import UniqueValuesExhaustedException
+
+
+class UniqueSequenceTestCase(unittest.TestCase):
+
+    def test_permutation(self):
+        for size in [1, 2, 10, 64, 97, 1000]:
+            sequence = UniqueSequence(size)
+            self.assertEqual(sorted(sequence.take(size)), list(range(size)))
+
+    def test_next(self):
+        sequence = UniqueSequence(100)
+        generated = [sequence.next() for _ in range(100)]
+        self.assertEqual(sorted(generated), list(range(100)))
+        self.assertNotEqual(generated, list(range(100)))
+
+    def test_exhausted(self):
+        sequence = UniqueSequence(10)
+        sequence.take(10)
+        with self.assertRaises(UniqueValuesExhaustedException):
+            sequence.next()
+
+    def test_seek(self):
+        generated = []
+        for offset in range(3):
+            sequence = UniqueSequence(30)
+            sequence.seek(offset, stride=3)
+            generated.extend(sequence.take(10))
+        self.assertEqual(sorted(generated), list(range(30)))
+
+    def test_large(self):
+        size = 62 ** 10
+        sequence = UniqueSequence(size)
+        sequence.seek(size - 1000)
+        generated = sequence.take(1000)
+        self.assertEqual(len(set(generated)), 1000)
+        self.assertTrue(all([0 <= i < size for i in generated]))
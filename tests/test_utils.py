@@ -0,0 +1,37 @@
+import unittest
+
+from mongo_dynamic_fixture.utils import chunked
+from mongo_dynamic_fixture.utils import iter_count
+from mongo_dynamic_fixture.utils import split_count
+from mongo_dynamic_fixture.utils import LRUCache
+
+
+class UtilsTestCase(unittest.TestCase):
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+    def test_iter_count(self):
+        self.assertEqual(list(iter_count(3)), [0, 1, 2])
+        counter = iter_count()
+        self.assertEqual([next(counter) for _ in range(5)], list(range(5)))
+
+    def test_split_count(self):
+        self.assertEqual(list(split_count(5, 2)), [2, 2, 1])
+        self.assertEqual(list(split_count(0, 2)), [])
+
+
+class LRUCacheTestCase(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)